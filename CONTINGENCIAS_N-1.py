@@ -1,13 +1,23 @@
+import os
 import sys
 import csv
+import re
+import time
 import numpy as np
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from dataclasses import dataclass, field, replace
 from typing import List, Optional, Dict, Tuple, Set
 
+try:
+    from scipy.optimize import linprog
+except ImportError:
+    linprog = None
+
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
     QPushButton, QLabel, QLineEdit, QTabWidget, QTableWidget, 
-    QTableWidgetItem, QSplitter, QFileDialog, QMessageBox, QListWidget
+    QTableWidgetItem, QSplitter, QFileDialog, QMessageBox, QListWidget, QCheckBox
 )
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QColor, QFont
@@ -15,6 +25,10 @@ from PyQt6.QtWidgets import QHeaderView
 
 POTENCIA_BASE_MVA = 100.0
 RUTA_CSV_POR_DEFECTO = ""
+TASA_SALIDA_FORZADA_LINEA = 0.01
+TASA_SALIDA_FORZADA_GENERADOR = 0.05
+CAMPOS_MODIFICABLES_LINEA = {"r": "resistencia_pu", "x": "reactancia_pu", "lim": "limite_potencia_mw"}
+CAMPOS_MODIFICABLES_NODO = {"pg": "potencia_generada_mw", "pmax": "potencia_maxima_mw", "pl": "potencia_carga_mw", "ql": "potencia_reactiva_mvar", "pf": "factor_participacion"}
 
 @dataclass
 class LineaTransmision:
@@ -28,6 +42,7 @@ class LineaTransmision:
     activa: bool
     nombre: str
     limite_potencia_mw: float = 0.0
+    tasa_salida_forzada: float = TASA_SALIDA_FORZADA_LINEA
 
 @dataclass
 class NodoElectrico:
@@ -40,6 +55,7 @@ class NodoElectrico:
     generador_activo: bool
     potencia_maxima_mw: float = 1000.0
     factor_participacion: float = 1.0
+    tasa_salida_forzada: float = TASA_SALIDA_FORZADA_GENERADOR
 
 @dataclass
 class ResultadosSistema:
@@ -136,6 +152,7 @@ def cargar_topologia(ruta_archivo: str) -> Tuple[List[LineaTransmision], List[No
             limite = convertir_texto_a_numero(buscar_columna(fila,["limit", "limit mw", "limite potencia", "limite"])) or 0.0
             resistencia_val = max(convertir_texto_a_numero(buscar_columna(fila,["r(pu)", "r (pu)", "r"])) or 0.0, 0.0)
             bcap_val = convertir_texto_a_numero(buscar_columna(fila, ["bcap(pu)", "bcap (pu)", "bcap"])) or 0.0
+            tasa_linea = convertir_texto_a_numero(buscar_columna(fila, ["for linea", "tasa falla linea"]))
             nueva_linea = LineaTransmision(
                 nodo_origen=int(origen_val), 
                 nodo_destino=int(destino_val), 
@@ -146,7 +163,8 @@ def cargar_topologia(ruta_archivo: str) -> Tuple[List[LineaTransmision], List[No
                 potencia_base_destino_mw=p_to, 
                 activa=True, 
                 nombre=f"{int(origen_val)}-{int(destino_val)}", 
-                limite_potencia_mw=limite
+                limite_potencia_mw=limite, 
+                tasa_salida_forzada=min(max(tasa_linea, 0.0), 1.0) if tasa_linea is not None else TASA_SALIDA_FORZADA_LINEA
             )
             lista_lineas.append(nueva_linea)
         id_nodo_val = convertir_texto_a_numero(buscar_columna(fila, ["bus", "busnum", "nodo"]))
@@ -159,6 +177,7 @@ def cargar_topologia(ruta_archivo: str) -> Tuple[List[LineaTransmision], List[No
             voltaje = max(0.5, min(1.5, convertir_texto_a_numero(buscar_columna(fila, ["voltage schedule", "v sched"])) or 1.0))
             pot_carga = max(convertir_texto_a_numero(buscar_columna(fila, ["pload", "pl"])) or 0.0, 0.0)
             react_carga = convertir_texto_a_numero(buscar_columna(fila, ["qload", "ql"])) or 0.0
+            tasa_gen = convertir_texto_a_numero(buscar_columna(fila, ["for gen", "tasa falla gen"]))
             nuevo_nodo = NodoElectrico(
                 id=id_nodo, 
                 tipo=tipo_nodo, 
@@ -168,7 +187,8 @@ def cargar_topologia(ruta_archivo: str) -> Tuple[List[LineaTransmision], List[No
                 potencia_reactiva_mvar=react_carga, 
                 generador_activo=True, 
                 potencia_maxima_mw=pot_max, 
-                factor_participacion=fac_part
+                factor_participacion=fac_part, 
+                tasa_salida_forzada=min(max(tasa_gen, 0.0), 1.0) if tasa_gen is not None else TASA_SALIDA_FORZADA_GENERADOR
             )
             diccionario_nodos[id_nodo] = nuevo_nodo
     lista_nodos = list(diccionario_nodos.values())
@@ -178,10 +198,835 @@ def cargar_topologia(ruta_archivo: str) -> Tuple[List[LineaTransmision], List[No
         for nodo in lista_nodos:
             nodo.potencia_generada_mw *= POTENCIA_BASE_MVA
             nodo.potencia_carga_mw *= POTENCIA_BASE_MVA
+            nodo.potencia_reactiva_mvar *= POTENCIA_BASE_MVA
             if nodo.potencia_maxima_mw <= 20.0:
                 nodo.potencia_maxima_mw *= POTENCIA_BASE_MVA
     return lista_lineas, lista_nodos
 
+def calcular_inyecciones_programadas_mw(lista_nodos: List[NodoElectrico], generadores_apagados: Set[int], cargas_apagadas: Set[int]) -> np.ndarray:
+    vector_P = np.zeros(len(lista_nodos))
+    potencia_gen_caida = sum(b.potencia_generada_mw for b in lista_nodos if b.generador_activo and b.id in generadores_apagados)
+    suma_factores_participacion = sum(b.factor_participacion for b in lista_nodos if b.generador_activo and b.id not in generadores_apagados)
+    for i, nodo in enumerate(lista_nodos):
+        potencia_gen = 0.0
+        if nodo.generador_activo and nodo.id not in generadores_apagados:
+            potencia_gen = nodo.potencia_generada_mw
+            if suma_factores_participacion > 0 and potencia_gen_caida > 0:
+                incremento_solicitado = potencia_gen_caida * (nodo.factor_participacion / suma_factores_participacion)
+                potencia_gen = min(nodo.potencia_maxima_mw, potencia_gen + incremento_solicitado)
+        potencia_carga = 0.0 if (nodo.id in cargas_apagadas) else nodo.potencia_carga_mw
+        vector_P[i] = potencia_gen - potencia_carga
+    return vector_P
+
+def es_nodo_control_voltaje(nodo: NodoElectrico) -> bool:
+    return nodo.tipo.strip().lower().startswith(("gen", "swing", "slack", "pv"))
+
+def es_nodo_generador(nodo: NodoElectrico) -> bool:
+    return nodo.generador_activo and (nodo.potencia_generada_mw > 0 or es_nodo_control_voltaje(nodo))
+
+def es_matriz_singular(matriz: np.ndarray, tolerancia: float = 1e-10) -> bool:
+    valores_singulares = np.linalg.svd(matriz, compute_uv=False)
+    return valores_singulares.size > 0 and valores_singulares[-1] <= tolerancia * max(valores_singulares[0], 1.0)
+
+class FactorizacionReutilizable:
+    def __init__(self, matriz_inversa: np.ndarray, cambios: Optional[Dict[Tuple[int, int], float]] = None):
+        self.matriz_inversa = matriz_inversa
+        self.cambios = dict(cambios or {})
+        self.indices = sorted({posicion for par in self.cambios for posicion in par})
+        self.columnas = None
+        self.nucleo = None
+        if self.indices:
+            posiciones = {indice: k for k, indice in enumerate(self.indices)}
+            bloque_delta = np.zeros((len(self.indices), len(self.indices)))
+            for (p, q), valor in self.cambios.items():
+                bloque_delta[posiciones[p], posiciones[q]] += valor
+            nucleo_interno = np.eye(len(self.indices)) + matriz_inversa[np.ix_(self.indices, self.indices)] @ bloque_delta
+            if es_matriz_singular(nucleo_interno):
+                raise np.linalg.LinAlgError("La modificacion deja la matriz singular (isla electrica).")
+            self.columnas = matriz_inversa[:, self.indices]
+            self.nucleo = bloque_delta @ np.linalg.inv(nucleo_interno)
+
+    @classmethod
+    def factorizar(cls, matriz: np.ndarray) -> "FactorizacionReutilizable":
+        matriz_inversa = np.linalg.inv(matriz)
+        if not np.allclose(matriz @ matriz_inversa, np.eye(len(matriz)), atol=1e-6):
+            raise np.linalg.LinAlgError("La matriz es singular (isla electrica).")
+        return cls(matriz_inversa)
+
+    def actualizar(self, cambios: Dict[Tuple[int, int], float]) -> "FactorizacionReutilizable":
+        if not cambios:
+            return self
+        cambios_combinados = dict(self.cambios)
+        for clave, valor in cambios.items():
+            cambios_combinados[clave] = cambios_combinados.get(clave, 0.0) + valor
+        return FactorizacionReutilizable(self.matriz_inversa, cambios_combinados)
+
+    def resolver(self, vector: np.ndarray) -> np.ndarray:
+        solucion = self.matriz_inversa @ vector
+        if self.indices:
+            solucion = solucion - self.columnas @ (self.nucleo @ solucion[self.indices])
+        return solucion
+
+    def inversa(self) -> np.ndarray:
+        if not self.indices:
+            return self.matriz_inversa
+        return self.matriz_inversa - self.columnas @ (self.nucleo @ self.matriz_inversa[self.indices, :])
+
+def reducir_cambios_matriz(cambios: Dict[Tuple[int, int], float], posiciones_reducidas: Dict[int, int]) -> Dict[Tuple[int, int], float]:
+    cambios_reducidos = {}
+    for (p, q), valor in cambios.items():
+        if p in posiciones_reducidas and q in posiciones_reducidas and abs(valor) > 0.0:
+            clave = (posiciones_reducidas[p], posiciones_reducidas[q])
+            cambios_reducidos[clave] = cambios_reducidos.get(clave, 0.0) + valor
+    return cambios_reducidos
+
+def agregar_cambio_linea(cambios: Dict[Tuple[int, int], float], i: int, j: int, susceptancia: float, shunt_medio: float = 0.0):
+    cambios[(i, i)] = cambios.get((i, i), 0.0) + susceptancia + shunt_medio
+    cambios[(j, j)] = cambios.get((j, j), 0.0) + susceptancia + shunt_medio
+    cambios[(i, j)] = cambios.get((i, j), 0.0) - susceptancia
+    cambios[(j, i)] = cambios.get((j, i), 0.0) - susceptancia
+
+def construir_matriz_incidencia(lista_lineas: List[LineaTransmision], mapa_indices_nodos: Dict[int, int]) -> np.ndarray:
+    matriz_incidencia = np.zeros((len(lista_lineas), len(mapa_indices_nodos)))
+    for L, linea in enumerate(lista_lineas):
+        i = mapa_indices_nodos.get(linea.nodo_origen)
+        j = mapa_indices_nodos.get(linea.nodo_destino)
+        if i is not None and j is not None:
+            matriz_incidencia[L, i] += 1.0
+            matriz_incidencia[L, j] -= 1.0
+    return matriz_incidencia
+
+def calcular_matrices_sensibilidad(matriz_F: np.ndarray, matriz_incidencia: np.ndarray, reactancias_pu: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    matriz_GSF = (matriz_incidencia @ matriz_F) / reactancias_pu[:, None]
+    matriz_PTDF_lineas = matriz_GSF @ matriz_incidencia.T
+    denominadores = reactancias_pu * (1.0 - np.diag(matriz_PTDF_lineas))
+    columnas_validas = np.any(matriz_incidencia != 0.0, axis=1) & (np.abs(denominadores) > 1e-6)
+    matriz_LODF = np.zeros_like(matriz_PTDF_lineas)
+    matriz_LODF[:, columnas_validas] = matriz_PTDF_lineas[:, columnas_validas] * (reactancias_pu[columnas_validas] / denominadores[columnas_validas])
+    indices_validos = np.flatnonzero(columnas_validas)
+    matriz_LODF[indices_validos, indices_validos] = -1.0
+    return matriz_GSF, matriz_LODF
+
+def calcular_riesgos_n_1_vectorizados(flujos_mw: np.ndarray, matriz_GSF: np.ndarray, matriz_LODF: np.ndarray, lineas_en_servicio: np.ndarray, lista_nodos: List[NodoElectrico], generadores_caidos: Set[int]) -> np.ndarray:
+    riesgos = np.abs(flujos_mw) * lineas_en_servicio
+    if np.any(lineas_en_servicio):
+        flujos_post_falla = flujos_mw[:, None] + matriz_LODF[:, lineas_en_servicio] * flujos_mw[lineas_en_servicio][None, :]
+        flujos_post_falla[np.flatnonzero(lineas_en_servicio), np.arange(int(np.sum(lineas_en_servicio)))] = 0.0
+        riesgos = np.maximum(riesgos, np.max(np.abs(flujos_post_falla), axis=1) * lineas_en_servicio)
+    disponibles = np.array([n.generador_activo and n.id not in generadores_caidos for n in lista_nodos])
+    participacion = np.array([n.factor_participacion for n in lista_nodos]) * disponibles
+    candidatos = [g for g, n in enumerate(lista_nodos) if disponibles[g] and n.potencia_generada_mw > 0]
+    if candidatos:
+        cambios_inyeccion = np.zeros((len(lista_nodos), len(candidatos)))
+        for columna, g in enumerate(candidatos):
+            potencia_perdida = lista_nodos[g].potencia_generada_mw
+            participacion_restante = participacion.copy()
+            participacion_restante[g] = 0.0
+            if participacion_restante.sum() > 0:
+                cambios_inyeccion[:, columna] = potencia_perdida * participacion_restante / participacion_restante.sum()
+            cambios_inyeccion[g, columna] -= potencia_perdida
+        flujos_post_falla = flujos_mw[:, None] + matriz_GSF @ cambios_inyeccion
+        riesgos = np.maximum(riesgos, np.max(np.abs(flujos_post_falla), axis=1) * lineas_en_servicio)
+    return riesgos
+
+@dataclass
+class ResultadoTransferencia:
+    indice_fuente: int
+    indice_sumidero: int
+    margen_mw: float
+    linea_limitante: Optional[int]
+    contingencia_limitante: Optional[int]
+
+def calcular_margen_hasta_limite(flujos_mw: np.ndarray, sensibilidades: np.ndarray, limites_mw: np.ndarray) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        margen = np.where(sensibilidades > 1e-5, (limites_mw - flujos_mw) / sensibilidades, np.where(sensibilidades < -1e-5, (-limites_mw - flujos_mw) / sensibilidades, np.inf))
+    return np.maximum(margen, 0.0)
+
+def calcular_capacidad_transferencia(flujos_mw: np.ndarray, matriz_GSF: np.ndarray, matriz_LODF: np.ndarray, limites_mw: np.ndarray, lineas_en_servicio: np.ndarray, pares: List[Tuple[int, int]], elementos_por_bloque: int = 2000000) -> List[ResultadoTransferencia]:
+    cantidad_lineas = len(flujos_mw)
+    if not pares:
+        return []
+    monitoreadas = lineas_en_servicio & (limites_mw > 0.0)
+    contingencias = np.flatnonzero(lineas_en_servicio & (np.abs(np.diag(matriz_LODF) + 1.0) < 1e-9))
+    matriz_PTDF = matriz_GSF[:, [s for s, _ in pares]] - matriz_GSF[:, [k for _, k in pares]]
+    margenes_base = calcular_margen_hasta_limite(flujos_mw[:, None], matriz_PTDF, limites_mw[:, None])
+    margenes_base[~monitoreadas, :] = np.inf
+    mejor_margen = np.min(margenes_base, axis=0)
+    mejor_linea = np.argmin(margenes_base, axis=0)
+    mejor_contingencia = np.full(len(pares), -1)
+    if len(contingencias) > 0:
+        lodf_contingencias = matriz_LODF[:, contingencias]
+        flujos_post_falla = flujos_mw[:, None] + lodf_contingencias * flujos_mw[contingencias][None, :]
+        excluidas = ~monitoreadas[:, None] | (np.arange(cantidad_lineas)[:, None] == contingencias[None, :])
+        tamano_bloque = max(1, elementos_por_bloque // (cantidad_lineas * len(contingencias)))
+        for inicio in range(0, len(pares), tamano_bloque):
+            bloque = slice(inicio, inicio + tamano_bloque)
+            matriz_OTDF = matriz_PTDF[:, None, bloque] + lodf_contingencias[:, :, None] * matriz_PTDF[contingencias, bloque][None, :, :]
+            margenes = calcular_margen_hasta_limite(flujos_post_falla[:, :, None], matriz_OTDF, limites_mw[:, None, None])
+            margenes[excluidas, :] = np.inf
+            margenes = margenes.reshape(cantidad_lineas * len(contingencias), -1)
+            posiciones = np.argmin(margenes, axis=0)
+            margen_bloque = margenes[posiciones, np.arange(margenes.shape[1])]
+            mejora = margen_bloque < mejor_margen[bloque]
+            mejor_margen[bloque] = np.where(mejora, margen_bloque, mejor_margen[bloque])
+            mejor_linea[bloque] = np.where(mejora, posiciones // len(contingencias), mejor_linea[bloque])
+            mejor_contingencia[bloque] = np.where(mejora, contingencias[posiciones % len(contingencias)], mejor_contingencia[bloque])
+    return [ResultadoTransferencia(
+        indice_fuente=s, 
+        indice_sumidero=k, 
+        margen_mw=float(mejor_margen[p]), 
+        linea_limitante=int(mejor_linea[p]) if np.isfinite(mejor_margen[p]) else None, 
+        contingencia_limitante=int(mejor_contingencia[p]) if np.isfinite(mejor_margen[p]) and mejor_contingencia[p] >= 0 else None
+    ) for p, (s, k) in enumerate(pares)]
+
+def pivotear_tableau(tableau: np.ndarray, fila: int, columna: int):
+    tableau[fila] /= tableau[fila, columna]
+    factores = tableau[:, columna].copy()
+    factores[fila] = 0.0
+    tableau -= factores[:, None] * tableau[fila][None, :]
+
+def iterar_simplex(tableau: np.ndarray, costos: np.ndarray, base: List[int], iteraciones_maximas: int, tolerancia: float = 1e-9) -> bool:
+    for _ in range(iteraciones_maximas):
+        costos_reducidos = costos - costos[base] @ tableau[:, :-1]
+        candidatas = np.flatnonzero(costos_reducidos < -tolerancia)
+        if len(candidatas) == 0:
+            return True
+        columna = candidatas[0]
+        positivos = np.flatnonzero(tableau[:, columna] > tolerancia)
+        if len(positivos) == 0:
+            return False
+        razones = tableau[positivos, -1] / tableau[positivos, columna]
+        empatadas = positivos[razones <= razones.min() + tolerancia]
+        fila = min(empatadas, key=lambda i: base[i])
+        pivotear_tableau(tableau, fila, columna)
+        base[fila] = columna
+    return False
+
+def resolver_simplex(costos: np.ndarray, A_ub: np.ndarray, b_ub: np.ndarray, A_eq: np.ndarray, b_eq: np.ndarray, iteraciones_maximas: int = 20000) -> Optional[np.ndarray]:
+    cantidad_variables = len(costos)
+    cantidad_ub, cantidad_eq = len(b_ub), len(b_eq)
+    cantidad_filas = cantidad_ub + cantidad_eq
+    matriz = np.zeros((cantidad_filas, cantidad_variables + cantidad_ub))
+    matriz[:cantidad_ub, :cantidad_variables] = A_ub
+    matriz[:cantidad_ub, cantidad_variables:] = np.eye(cantidad_ub)
+    matriz[cantidad_ub:, :cantidad_variables] = A_eq
+    lado_derecho = np.concatenate([b_ub, b_eq]).astype(float)
+    negativos = lado_derecho < 0.0
+    matriz[negativos] *= -1.0
+    lado_derecho[negativos] *= -1.0
+    filas_artificiales = [i for i in range(cantidad_filas) if i >= cantidad_ub or negativos[i]]
+    columnas_reales = cantidad_variables + cantidad_ub
+    tableau = np.zeros((cantidad_filas, columnas_reales + len(filas_artificiales) + 1))
+    tableau[:, :columnas_reales] = matriz
+    tableau[:, -1] = lado_derecho
+    base = [cantidad_variables + i if i < cantidad_ub and not negativos[i] else -1 for i in range(cantidad_filas)]
+    for k, i in enumerate(filas_artificiales):
+        tableau[i, columnas_reales + k] = 1.0
+        base[i] = columnas_reales + k
+    if filas_artificiales:
+        costos_fase_1 = np.zeros(tableau.shape[1] - 1)
+        costos_fase_1[columnas_reales:] = 1.0
+        if not iterar_simplex(tableau, costos_fase_1, base, iteraciones_maximas) or tableau[[i for i, b in enumerate(base) if b >= columnas_reales], -1].sum() > 1e-7:
+            return None
+        filas_redundantes = []
+        for i, columna_base in enumerate(base):
+            if columna_base >= columnas_reales:
+                candidatas = np.flatnonzero(np.abs(tableau[i, :columnas_reales]) > 1e-9)
+                if len(candidatas) > 0:
+                    pivotear_tableau(tableau, i, candidatas[0])
+                    base[i] = candidatas[0]
+                else:
+                    filas_redundantes.append(i)
+        filas_conservadas = [i for i in range(cantidad_filas) if i not in filas_redundantes]
+        tableau = np.hstack([tableau[filas_conservadas, :columnas_reales], tableau[filas_conservadas, -1:]])
+        base = [base[i] for i in filas_conservadas]
+    costos_fase_2 = np.zeros(columnas_reales)
+    costos_fase_2[:cantidad_variables] = costos
+    if not iterar_simplex(tableau, costos_fase_2, base, iteraciones_maximas):
+        return None
+    solucion = np.zeros(columnas_reales)
+    solucion[base] = tableau[:, -1]
+    return solucion[:cantidad_variables]
+
+def resolver_programa_lineal(costos: np.ndarray, A_ub: np.ndarray, b_ub: np.ndarray, A_eq: np.ndarray, b_eq: np.ndarray, cotas_superiores: np.ndarray, permitir_solucionador_externo: bool = True) -> Tuple[Optional[np.ndarray], str]:
+    if linprog is not None and permitir_solucionador_externo:
+        resultado = linprog(costos, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq, bounds=list(zip(np.zeros(len(costos)), cotas_superiores)), method="highs")
+        return (resultado.x if resultado.status == 0 else None), "HiGHS"
+    A_ub_con_cotas = np.vstack([A_ub, np.eye(len(costos))])
+    b_ub_con_cotas = np.concatenate([b_ub, cotas_superiores])
+    return resolver_simplex(costos, A_ub_con_cotas, b_ub_con_cotas, A_eq, b_eq), "Simplex interno"
+
+@dataclass
+class ResultadoRedespacho:
+    ajustes_mw: List[float]
+    generacion_inicial_mw: List[float]
+    total_mw: float
+    factible: bool
+    restricciones_activas: int
+    rondas: int
+    solucionador: str
+
+class SolucionadorRedespacho:
+    def __init__(self, permitir_solucionador_externo: bool = True):
+        self.permitir_solucionador_externo = permitir_solucionador_externo
+        self.restricciones_previas: Set[Tuple[int, int]] = set()
+
+    def nombre_solucionador(self) -> str:
+        return "HiGHS" if linprog is not None and self.permitir_solucionador_externo else "Simplex interno"
+
+    def resolver(self, flujos_mw: np.ndarray, matriz_GSF: np.ndarray, matriz_LODF: np.ndarray, limites_mw: np.ndarray, lineas_en_servicio: np.ndarray, lista_nodos: List[NodoElectrico], generadores_caidos: Set[int], cargas_caidas: Set[int], tolerancia_mw: float = 1e-3, rondas_maximas: int = 50) -> ResultadoRedespacho:
+        cantidad_nodos = len(lista_nodos)
+        inyecciones = calcular_inyecciones_programadas_mw(lista_nodos, generadores_caidos, cargas_caidas)
+        generacion = np.array([n.potencia_generada_mw if n.generador_activo and n.id not in generadores_caidos else 0.0 for n in lista_nodos])
+        generacion[0] = -inyecciones[1:].sum() + (0.0 if lista_nodos[0].id in cargas_caidas else lista_nodos[0].potencia_carga_mw)
+        controlables = np.array([i for i, n in enumerate(lista_nodos) if (es_nodo_generador(n) or (i == 0 and n.generador_activo)) and n.id not in generadores_caidos])
+        holgura_subir = np.maximum(np.array([lista_nodos[i].potencia_maxima_mw for i in controlables]) - generacion[controlables], 0.0)
+        holgura_bajar = np.maximum(generacion[controlables], 0.0)
+        monitoreadas = lineas_en_servicio & (limites_mw > 0.0)
+        contingencias = np.flatnonzero(lineas_en_servicio & (np.abs(np.diag(matriz_LODF) + 1.0) < 1e-9))
+        disponibles = np.array([n.generador_activo and n.id not in generadores_caidos for n in lista_nodos])
+        participacion = np.array([n.factor_participacion for n in lista_nodos]) * disponibles
+        disparos = np.array([g for g, n in enumerate(lista_nodos) if disponibles[g] and n.potencia_generada_mw > 0], dtype=int)
+        redistribucion_disparo = np.zeros((cantidad_nodos, len(disparos)))
+        for columna, g in enumerate(disparos):
+            participacion_restante = participacion.copy()
+            participacion_restante[g] = 0.0
+            if participacion_restante.sum() > 0:
+                redistribucion_disparo[:, columna] = participacion_restante / participacion_restante.sum()
+            redistribucion_disparo[g, columna] -= 1.0
+        sensibilidades_disparo = matriz_GSF @ redistribucion_disparo
+        # Los disparos de generador g se identifican con la columna -2 - g.
+        columnas = np.concatenate([[-1], contingencias, -2 - disparos]).astype(int)
+        posicion_disparo = {int(g): k for k, g in enumerate(disparos)}
+
+        def flujos_por_caso(flujos: np.ndarray, ajustes: np.ndarray) -> np.ndarray:
+            casos = np.empty((len(flujos), len(columnas)))
+            casos[:, 0] = flujos
+            casos[:, 1:1 + len(contingencias)] = flujos[:, None] + matriz_LODF[:, contingencias] * flujos[contingencias][None, :]
+            casos[:, 1 + len(contingencias):] = flujos[:, None] + sensibilidades_disparo * (generacion[disparos] + ajustes[disparos])[None, :]
+            casos[np.flatnonzero(~monitoreadas), :] = 0.0
+            casos[contingencias, np.arange(1, 1 + len(contingencias))] = 0.0
+            return casos
+
+        def violaciones(casos: np.ndarray) -> Set[Tuple[int, int]]:
+            lineas, posiciones = np.nonzero(np.abs(casos) > limites_mw[:, None] + tolerancia_mw)
+            return {(int(l), int(columnas[p])) for l, p in zip(lineas, posiciones)}
+
+        ajustes = np.zeros(cantidad_nodos)
+        flujos_caso = flujos_por_caso(flujos_mw, ajustes)
+        nuevas = violaciones(flujos_caso)
+        if not nuevas or len(controlables) == 0:
+            return ResultadoRedespacho(ajustes.tolist(), generacion.tolist(), 0.0, not nuevas, 0, 0, self.nombre_solucionador())
+        validas = set((int(l), int(c)) for l in np.flatnonzero(monitoreadas) for c in columnas)
+        activas = (self.restricciones_previas & validas) | nuevas
+        posicion_columna = {int(c): k for k, c in enumerate(columnas)}
+        cantidad_controlables = len(controlables)
+        costos = np.ones(2 * cantidad_controlables)
+        A_eq = np.concatenate([np.ones(cantidad_controlables), -np.ones(cantidad_controlables)])[None, :]
+        b_eq = np.zeros(1)
+        cotas = np.concatenate([holgura_subir, holgura_bajar])
+        solucionador = self.nombre_solucionador()
+
+        def sensibilidad_restriccion(l: int, c: int) -> np.ndarray:
+            if c >= 0:
+                return matriz_GSF[l, controlables] + matriz_LODF[l, c] * matriz_GSF[c, controlables]
+            sensibilidad = matriz_GSF[l, controlables].copy()
+            if c <= -2:
+                sensibilidad[controlables == -2 - c] += sensibilidades_disparo[l, posicion_disparo[-2 - c]]
+            return sensibilidad
+
+        for ronda in range(1, rondas_maximas + 1):
+            restricciones = sorted(activas)
+            sensibilidades = np.array([sensibilidad_restriccion(l, c) for l, c in restricciones])
+            flujos_restriccion = np.array([flujos_caso[l, posicion_columna[c]] for l, c in restricciones])
+            limites_restriccion = limites_mw[[l for l, _ in restricciones]]
+            A_ub = np.vstack([np.hstack([sensibilidades, -sensibilidades]), np.hstack([-sensibilidades, sensibilidades])])
+            b_ub = np.concatenate([limites_restriccion - flujos_restriccion, limites_restriccion + flujos_restriccion])
+            solucion, solucionador = resolver_programa_lineal(costos, A_ub, b_ub, A_eq, b_eq, cotas, self.permitir_solucionador_externo)
+            if solucion is None:
+                self.restricciones_previas = activas
+                return ResultadoRedespacho(ajustes.tolist(), generacion.tolist(), 0.0, False, len(activas), ronda, solucionador)
+            ajustes = np.zeros(cantidad_nodos)
+            ajustes[controlables] = solucion[:cantidad_controlables] - solucion[cantidad_controlables:]
+            nuevas = violaciones(flujos_por_caso(flujos_mw + matriz_GSF @ ajustes, ajustes)) - activas
+            if not nuevas:
+                break
+            activas |= nuevas
+        self.restricciones_previas = activas
+        return ResultadoRedespacho(ajustes.tolist(), generacion.tolist(), float(np.abs(ajustes).sum() / 2.0), not nuevas, len(activas), ronda, solucionador)
+
+@dataclass
+class EscenarioRed:
+    nombre: str
+    cambios_lineas: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    cambios_nodos: Dict[int, Dict[str, float]] = field(default_factory=dict)
+    lineas_apagadas: Set[str] = field(default_factory=set)
+    generadores_apagados: Set[int] = field(default_factory=set)
+    cargas_apagadas: Set[int] = field(default_factory=set)
+
+    def materializar_lineas(self, lista_lineas: List[LineaTransmision]) -> List[LineaTransmision]:
+        if not self.cambios_lineas:
+            return lista_lineas
+        return [replace(linea, **self.cambios_lineas[f"{linea.nodo_origen}-{linea.nodo_destino}"]) if f"{linea.nodo_origen}-{linea.nodo_destino}" in self.cambios_lineas else linea for linea in lista_lineas]
+
+    def materializar_nodos(self, lista_nodos: List[NodoElectrico]) -> List[NodoElectrico]:
+        if not self.cambios_nodos:
+            return lista_nodos
+        return [replace(nodo, **self.cambios_nodos[nodo.id]) if nodo.id in self.cambios_nodos else nodo for nodo in lista_nodos]
+
+@dataclass
+class ResultadosEscenario:
+    nombre: str
+    flujos_mw: List[float]
+    riesgos_n_1: List[float]
+    limites_mw: List[float]
+    lineas_en_servicio: List[bool]
+    topologia_valida: bool
+    tiempo_ms: float = 0.0
+
+class ResolutorEscenarios:
+    def __init__(self, lista_lineas: List[LineaTransmision], lista_nodos: List[NodoElectrico], mapa_indices_nodos: Dict[int, int]):
+        self.lista_lineas = lista_lineas
+        self.lista_nodos = lista_nodos
+        self.mapa_indices_nodos = mapa_indices_nodos
+        self.matriz_incidencia = construir_matriz_incidencia(lista_lineas, mapa_indices_nodos)
+        self.lineas_conectadas = np.any(self.matriz_incidencia != 0.0, axis=1)
+        self.susceptancias_base = self.calcular_susceptancias(lista_lineas, set())
+        matriz_B = self.matriz_incidencia.T @ (self.susceptancias_base[:, None] * self.matriz_incidencia)
+        self.posiciones_reducidas = {i: i - 1 for i in range(1, len(lista_nodos))}
+        self.factor_base = FactorizacionReutilizable.factorizar(matriz_B[1:, 1:])
+
+    def calcular_susceptancias(self, lista_lineas: List[LineaTransmision], lineas_apagadas: Set[str]) -> np.ndarray:
+        return np.array([1.0 / linea.reactancia_pu if linea.activa and self.lineas_conectadas[L] and f"{linea.nodo_origen}-{linea.nodo_destino}" not in lineas_apagadas else 0.0 for L, linea in enumerate(lista_lineas)])
+
+    def cambios_topologicos(self, susceptancias: np.ndarray) -> Dict[Tuple[int, int], float]:
+        cambios = {}
+        for L in np.flatnonzero(np.abs(susceptancias - self.susceptancias_base) > 1e-12):
+            i = self.mapa_indices_nodos[self.lista_lineas[L].nodo_origen]
+            j = self.mapa_indices_nodos[self.lista_lineas[L].nodo_destino]
+            agregar_cambio_linea(cambios, i, j, susceptancias[L] - self.susceptancias_base[L])
+        return reducir_cambios_matriz(cambios, self.posiciones_reducidas)
+
+    def resolver_lote(self, escenarios: List[EscenarioRed]) -> List[ResultadosEscenario]:
+        grupos: Dict[Tuple, List[int]] = {}
+        preparados = []
+        for k, escenario in enumerate(escenarios):
+            lineas_escenario = escenario.materializar_lineas(self.lista_lineas)
+            nodos_escenario = escenario.materializar_nodos(self.lista_nodos)
+            susceptancias = self.calcular_susceptancias(lineas_escenario, escenario.lineas_apagadas)
+            cambios = self.cambios_topologicos(susceptancias)
+            preparados.append((lineas_escenario, nodos_escenario, susceptancias, cambios))
+            grupos.setdefault(tuple(sorted(cambios.items())), []).append(k)
+        resultados: List[Optional[ResultadosEscenario]] = [None] * len(escenarios)
+        for indices_grupo in grupos.values():
+            inicio = time.perf_counter()
+            _, _, susceptancias, cambios = preparados[indices_grupo[0]]
+            lineas_en_servicio = susceptancias > 0.0
+            try:
+                factor = self.factor_base.actualizar(cambios)
+            except np.linalg.LinAlgError:
+                for k in indices_grupo:
+                    resultados[k] = ResultadosEscenario(escenarios[k].nombre, [0.0] * len(self.lista_lineas), [0.0] * len(self.lista_lineas), [l.limite_potencia_mw for l in preparados[k][0]], lineas_en_servicio.tolist(), False)
+                continue
+            matriz_P = np.column_stack([calcular_inyecciones_programadas_mw(preparados[k][1], escenarios[k].generadores_apagados, escenarios[k].cargas_apagadas) for k in indices_grupo]) / POTENCIA_BASE_MVA
+            angulos = np.zeros_like(matriz_P)
+            angulos[1:, :] = factor.resolver(matriz_P[1:, :])
+            matriz_flujos = (susceptancias[:, None] * (self.matriz_incidencia @ angulos)) * POTENCIA_BASE_MVA
+            matriz_F = np.zeros((len(self.lista_nodos), len(self.lista_nodos)))
+            matriz_F[1:, 1:] = factor.inversa()
+            tiempo_comun = time.perf_counter() - inicio
+            for columna, k in enumerate(indices_grupo):
+                inicio = time.perf_counter()
+                lineas_escenario, nodos_escenario = preparados[k][0], preparados[k][1]
+                matriz_GSF, matriz_LODF = calcular_matrices_sensibilidad(matriz_F, self.matriz_incidencia, np.array([l.reactancia_pu for l in lineas_escenario]))
+                flujos = matriz_flujos[:, columna]
+                riesgos = calcular_riesgos_n_1_vectorizados(flujos, matriz_GSF, matriz_LODF, lineas_en_servicio, nodos_escenario, escenarios[k].generadores_apagados)
+                tiempo_ms = (tiempo_comun / len(indices_grupo) + time.perf_counter() - inicio) * 1000.0
+                resultados[k] = ResultadosEscenario(escenarios[k].nombre, flujos.tolist(), riesgos.tolist(), [l.limite_potencia_mw for l in lineas_escenario], lineas_en_servicio.tolist(), True, tiempo_ms)
+        return resultados
+
+@dataclass
+class ResultadoCascada:
+    evento_inicial: Tuple[str, ...]
+    profundidad: int
+    lineas_perdidas: int
+    formo_isla: bool
+
+class SimuladorCascadas:
+    def __init__(self, lista_lineas: List[LineaTransmision], lista_nodos: List[NodoElectrico], capacidad_cache_factores: int = 256):
+        self.lista_lineas = lista_lineas
+        self.lista_nodos = lista_nodos
+        self.resolutor = ResolutorEscenarios(lista_lineas, lista_nodos, {nodo.id: i for i, nodo in enumerate(lista_nodos)})
+        self.nombres_lineas = [f"{l.nodo_origen}-{l.nodo_destino}" for l in lista_lineas]
+        self.limites_mw = np.array([l.limite_potencia_mw for l in lista_lineas])
+        self.capacidad_cache_factores = capacidad_cache_factores
+        self.cache_factores: Dict[frozenset, Optional[FactorizacionReutilizable]] = {}
+        self.transiciones: Dict[Tuple[frozenset, frozenset], Optional[frozenset]] = {}
+
+    def obtener_factor(self, lineas_abiertas: frozenset, susceptancias: np.ndarray) -> Optional[FactorizacionReutilizable]:
+        if lineas_abiertas not in self.cache_factores:
+            if len(self.cache_factores) >= self.capacidad_cache_factores:
+                self.cache_factores.pop(next(iter(self.cache_factores)))
+            try:
+                self.cache_factores[lineas_abiertas] = self.resolutor.factor_base.actualizar(self.resolutor.cambios_topologicos(susceptancias))
+            except np.linalg.LinAlgError:
+                self.cache_factores[lineas_abiertas] = None
+        return self.cache_factores[lineas_abiertas]
+
+    def siguiente_disparo(self, lineas_abiertas: frozenset, generadores_caidos: frozenset) -> Optional[frozenset]:
+        clave = (lineas_abiertas, generadores_caidos)
+        if clave not in self.transiciones:
+            susceptancias = self.resolutor.calcular_susceptancias(self.lista_lineas, lineas_abiertas)
+            factor = self.obtener_factor(lineas_abiertas, susceptancias)
+            if factor is None:
+                self.transiciones[clave] = None
+            else:
+                vector_P = calcular_inyecciones_programadas_mw(self.lista_nodos, generadores_caidos, set()) / POTENCIA_BASE_MVA
+                angulos = np.zeros(len(self.lista_nodos))
+                angulos[1:] = factor.resolver(vector_P[1:])
+                flujos = susceptancias * (self.resolutor.matriz_incidencia @ angulos) * POTENCIA_BASE_MVA
+                sobrecargadas = np.flatnonzero((susceptancias > 0.0) & (self.limites_mw > 0.0) & (np.abs(flujos) > self.limites_mw))
+                self.transiciones[clave] = frozenset(self.nombres_lineas[L] for L in sobrecargadas)
+        return self.transiciones[clave]
+
+    def simular(self, evento_inicial: Tuple[str, ...]) -> ResultadoCascada:
+        lineas_abiertas = frozenset(e[1:] for e in evento_inicial if e.startswith('l'))
+        generadores_caidos = frozenset(int(e[1:]) for e in evento_inicial if e.startswith('g'))
+        profundidad = 0
+        while True:
+            lineas_quemadas = self.siguiente_disparo(lineas_abiertas, generadores_caidos)
+            if lineas_quemadas is None:
+                return ResultadoCascada(evento_inicial, profundidad, len(lineas_abiertas), True)
+            if not lineas_quemadas:
+                return ResultadoCascada(evento_inicial, profundidad, len(lineas_abiertas), False)
+            lineas_abiertas = lineas_abiertas | lineas_quemadas
+            profundidad += 1
+
+def generar_eventos_iniciales(lista_lineas: List[LineaTransmision], lista_nodos: List[NodoElectrico], incluir_dobles: bool = True) -> List[Tuple[str, ...]]:
+    ids_nodos = {nodo.id for nodo in lista_nodos}
+    elementos = list(dict.fromkeys(f"l{l.nodo_origen}-{l.nodo_destino}" for l in lista_lineas if l.activa and l.nodo_origen in ids_nodos and l.nodo_destino in ids_nodos))
+    elementos += [f"g{n.id}" for n in lista_nodos if n.generador_activo and n.potencia_generada_mw > 0]
+    eventos = [(elemento,) for elemento in elementos]
+    if incluir_dobles:
+        eventos += list(combinations(elementos, 2))
+    return eventos
+
+simulador_cascadas_del_proceso: Optional[SimuladorCascadas] = None
+red_cascadas_del_proceso: Optional[Tuple[List[LineaTransmision], List[NodoElectrico]]] = None
+
+def inicializar_proceso_cascadas(lista_lineas: List[LineaTransmision], lista_nodos: List[NodoElectrico]):
+    global simulador_cascadas_del_proceso, red_cascadas_del_proceso
+    simulador_cascadas_del_proceso = None
+    red_cascadas_del_proceso = (lista_lineas, lista_nodos)
+
+def simular_bloque_cascadas(eventos: List[Tuple[str, ...]]) -> List[ResultadoCascada]:
+    global simulador_cascadas_del_proceso
+    if simulador_cascadas_del_proceso is None:
+        simulador_cascadas_del_proceso = SimuladorCascadas(*red_cascadas_del_proceso)
+    return [simulador_cascadas_del_proceso.simular(evento) for evento in eventos]
+
+def barrer_cascadas(lista_lineas: List[LineaTransmision], lista_nodos: List[NodoElectrico], incluir_dobles: bool = True, procesos: Optional[int] = None, eventos_minimos_paralelo: int = 200) -> List[ResultadoCascada]:
+    eventos = generar_eventos_iniciales(lista_lineas, lista_nodos, incluir_dobles)
+    procesos = procesos or os.cpu_count() or 1
+    if procesos <= 1 or len(eventos) < eventos_minimos_paralelo:
+        simulador = SimuladorCascadas(lista_lineas, lista_nodos)
+        resultados = [simulador.simular(evento) for evento in eventos]
+    else:
+        tamano_bloque = max(1, -(-len(eventos) // (procesos * 4)))
+        bloques = [eventos[i:i + tamano_bloque] for i in range(0, len(eventos), tamano_bloque)]
+        with ProcessPoolExecutor(max_workers=procesos, initializer=inicializar_proceso_cascadas, initargs=(lista_lineas, lista_nodos)) as ejecutor:
+            resultados = [resultado for bloque in ejecutor.map(simular_bloque_cascadas, bloques) for resultado in bloque]
+    resultados.sort(key=lambda r: (r.formo_isla, r.lineas_perdidas, r.profundidad), reverse=True)
+    return resultados
+
+@dataclass
+class ParametrosMonteCarlo:
+    desviacion_carga: float = 0.05
+    desviacion_generacion: float = 0.05
+    correlacion: float = 0.8
+    muestras_por_lote: int = 2000
+
+@dataclass
+class EstadisticasMonteCarlo:
+    muestras: int = 0
+    eventos_perdida_carga: int = 0
+    suma_potencia_no_suministrada_mw: float = 0.0
+    suma_cuadrados_potencia_no_suministrada: float = 0.0
+    eventos_sobrecarga: int = 0
+    eventos_isla: int = 0
+    sobrecargas_por_linea: Optional[np.ndarray] = None
+
+    def acumular(self, otra: "EstadisticasMonteCarlo"):
+        self.muestras += otra.muestras
+        self.eventos_perdida_carga += otra.eventos_perdida_carga
+        self.suma_potencia_no_suministrada_mw += otra.suma_potencia_no_suministrada_mw
+        self.suma_cuadrados_potencia_no_suministrada += otra.suma_cuadrados_potencia_no_suministrada
+        self.eventos_sobrecarga += otra.eventos_sobrecarga
+        self.eventos_isla += otra.eventos_isla
+        self.sobrecargas_por_linea = otra.sobrecargas_por_linea.copy() if self.sobrecargas_por_linea is None else self.sobrecargas_por_linea + otra.sobrecargas_por_linea
+
+    def probabilidad(self, eventos: float, z: float = 1.96) -> Tuple[float, float]:
+        if self.muestras == 0:
+            return 0.0, 0.0
+        p = eventos / self.muestras
+        return p, z * np.sqrt(max(p * (1.0 - p), 1.0 / self.muestras) / self.muestras)
+
+    def potencia_no_suministrada_esperada(self, z: float = 1.96) -> Tuple[float, float]:
+        if self.muestras == 0:
+            return 0.0, 0.0
+        media = self.suma_potencia_no_suministrada_mw / self.muestras
+        varianza = max(self.suma_cuadrados_potencia_no_suministrada / self.muestras - media ** 2, 0.0)
+        return media, z * np.sqrt(varianza / self.muestras)
+
+class EvaluadorMonteCarlo:
+    def __init__(self, lista_lineas: List[LineaTransmision], lista_nodos: List[NodoElectrico], parametros: ParametrosMonteCarlo):
+        self.parametros = parametros
+        resolutor = ResolutorEscenarios(lista_lineas, lista_nodos, {nodo.id: i for i, nodo in enumerate(lista_nodos)})
+        matriz_F = np.zeros((len(lista_nodos), len(lista_nodos)))
+        matriz_F[1:, 1:] = resolutor.factor_base.inversa()
+        self.lineas_en_servicio = resolutor.susceptancias_base > 0.0
+        self.matriz_GSF = (resolutor.matriz_incidencia @ matriz_F) * resolutor.susceptancias_base[:, None]
+        self.matriz_PTDF_lineas = self.matriz_GSF @ resolutor.matriz_incidencia.T
+        self.limites_mw = np.array([l.limite_potencia_mw for l in lista_lineas])
+        self.tasas_lineas = np.array([l.tasa_salida_forzada for l in lista_lineas]) * self.lineas_en_servicio
+        self.generacion_mw = np.array([n.potencia_generada_mw if n.generador_activo else 0.0 for n in lista_nodos])
+        self.carga_mw = np.array([n.potencia_carga_mw for n in lista_nodos])
+        self.potencia_maxima_mw = np.array([n.potencia_maxima_mw for n in lista_nodos])
+        self.participacion = np.array([n.factor_participacion if n.generador_activo else 0.0 for n in lista_nodos])
+        self.generadores = np.array([es_nodo_generador(n) for n in lista_nodos])
+        self.tasas_generadores = np.array([n.tasa_salida_forzada for n in lista_nodos]) * self.generadores
+        self.incidencia_absoluta = np.abs(resolutor.matriz_incidencia)
+
+    def perturbar(self, generador: np.random.Generator, valores_mw: np.ndarray, desviacion: float, cantidad: int) -> np.ndarray:
+        correlacion = min(max(self.parametros.correlacion, 0.0), 1.0)
+        comun = generador.standard_normal((1, cantidad))
+        individual = generador.standard_normal((len(valores_mw), cantidad))
+        factores = 1.0 + desviacion * (np.sqrt(correlacion) * comun + np.sqrt(1.0 - correlacion) * individual)
+        return valores_mw[:, None] * np.maximum(factores, 0.0)
+
+    def nodos_aislados(self, salientes: np.ndarray) -> np.ndarray:
+        en_servicio = self.lineas_en_servicio.copy()
+        en_servicio[salientes] = False
+        adyacencia = (self.incidencia_absoluta.T @ (en_servicio[:, None] * self.incidencia_absoluta)) > 0.0
+        alcanzados = np.zeros(len(adyacencia), dtype=bool)
+        alcanzados[0] = True
+        while True:
+            nuevos = alcanzados | np.any(adyacencia[alcanzados], axis=0)
+            if np.array_equal(nuevos, alcanzados):
+                return ~alcanzados
+            alcanzados = nuevos
+
+    def evaluar_lote(self, semilla: np.random.SeedSequence, cantidad: Optional[int] = None) -> EstadisticasMonteCarlo:
+        generador = np.random.default_rng(semilla)
+        cantidad = cantidad or self.parametros.muestras_por_lote
+        salidas_lineas = generador.random((len(self.tasas_lineas), cantidad)) < self.tasas_lineas[:, None]
+        disponibles = generador.random((len(self.tasas_generadores), cantidad)) >= self.tasas_generadores[:, None]
+        carga = self.perturbar(generador, self.carga_mw, self.parametros.desviacion_carga, cantidad)
+        generacion = self.perturbar(generador, self.generacion_mw, self.parametros.desviacion_generacion, cantidad)
+        potencia_perdida = np.sum(generacion * ~disponibles, axis=0)
+        participacion = self.participacion[:, None] * disponibles
+        suma_participacion = participacion.sum(axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            incremento = np.where(suma_participacion > 0, potencia_perdida / suma_participacion, 0.0)[None, :] * participacion
+        generacion = np.where(disponibles, np.minimum(self.potencia_maxima_mw[:, None], generacion + incremento), 0.0)
+        referencia_caida = np.flatnonzero(~disponibles[0])
+        if len(referencia_caida):
+            participacion_restante = participacion[1:, referencia_caida] * self.generadores[1:, None]
+            suma_restante = participacion_restante.sum(axis=0)
+            balance = carga[:, referencia_caida].sum(axis=0) - generacion[:, referencia_caida].sum(axis=0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                reparto = np.where(suma_restante > 0, balance / suma_restante, 0.0)[None, :] * participacion_restante
+            generacion[1:, referencia_caida] = np.clip(generacion[1:, referencia_caida] + reparto, 0.0, self.potencia_maxima_mw[1:, None])
+        flujos = self.matriz_GSF @ ((generacion - carga) / POTENCIA_BASE_MVA) * POTENCIA_BASE_MVA
+        islas = np.zeros(cantidad, dtype=bool)
+        conectados = np.ones_like(carga, dtype=bool)
+        patrones, inverso = np.unique(salidas_lineas.T, axis=0, return_inverse=True)
+        inverso = np.ravel(inverso)
+        for k, patron in enumerate(patrones):
+            salientes = np.flatnonzero(patron)
+            if len(salientes) == 0:
+                continue
+            muestras = np.flatnonzero(inverso == k)
+            matriz_reducida = np.eye(len(salientes)) - self.matriz_PTDF_lineas[np.ix_(salientes, salientes)]
+            if es_matriz_singular(matriz_reducida):
+                islas[muestras] = True
+                conectados[np.ix_(self.nodos_aislados(salientes), muestras)] = False
+                continue
+            flujos[:, muestras] += self.matriz_PTDF_lineas[:, salientes] @ np.linalg.solve(matriz_reducida, flujos[np.ix_(salientes, muestras)])
+            flujos[np.ix_(salientes, muestras)] = 0.0
+        capacidad = np.sum(self.potencia_maxima_mw[:, None] * (disponibles & self.generadores[:, None] & conectados), axis=0)
+        potencia_no_suministrada = np.maximum(np.sum(carga * conectados, axis=0) - capacidad, 0.0) + np.sum(carga * ~conectados, axis=0)
+        perdida_carga = potencia_no_suministrada > 0.0
+        monitoreadas = (self.limites_mw > 0.0)[:, None] & ~salidas_lineas & ~islas[None, :]
+        sobrecargas = monitoreadas & (np.abs(flujos) > self.limites_mw[:, None])
+        return EstadisticasMonteCarlo(
+            muestras=cantidad, 
+            eventos_perdida_carga=int(perdida_carga.sum()), 
+            suma_potencia_no_suministrada_mw=float(potencia_no_suministrada.sum()), 
+            suma_cuadrados_potencia_no_suministrada=float(np.sum(potencia_no_suministrada ** 2)), 
+            eventos_sobrecarga=int(np.any(sobrecargas, axis=0).sum()), 
+            eventos_isla=int(islas.sum()), 
+            sobrecargas_por_linea=sobrecargas.sum(axis=1)
+        )
+
+evaluador_monte_carlo_del_proceso: Optional[EvaluadorMonteCarlo] = None
+
+def inicializar_proceso_monte_carlo(lista_lineas: List[LineaTransmision], lista_nodos: List[NodoElectrico], parametros: ParametrosMonteCarlo):
+    global evaluador_monte_carlo_del_proceso
+    evaluador_monte_carlo_del_proceso = EvaluadorMonteCarlo(lista_lineas, lista_nodos, parametros)
+
+def evaluar_lote_monte_carlo(semilla: np.random.SeedSequence, cantidad: int) -> EstadisticasMonteCarlo:
+    return evaluador_monte_carlo_del_proceso.evaluar_lote(semilla, cantidad)
+
+def ejecutar_monte_carlo(lista_lineas: List[LineaTransmision], lista_nodos: List[NodoElectrico], parametros: ParametrosMonteCarlo, semilla: int = 12345, muestras_maximas: int = 200000, tolerancia: float = 0.002, lotes_por_ronda: int = 8, procesos: Optional[int] = None) -> Tuple[EstadisticasMonteCarlo, bool]:
+    procesos = procesos or os.cpu_count() or 1
+    evaluador = EvaluadorMonteCarlo(lista_lineas, lista_nodos, parametros)
+    secuencia_semillas = np.random.SeedSequence(semilla)
+    estadisticas = EstadisticasMonteCarlo()
+    convergio = False
+    ejecutor = ProcessPoolExecutor(max_workers=procesos, initializer=inicializar_proceso_monte_carlo, initargs=(lista_lineas, lista_nodos, parametros)) if procesos > 1 else None
+    try:
+        while estadisticas.muestras < muestras_maximas:
+            restantes = muestras_maximas - estadisticas.muestras
+            cantidades = [min(parametros.muestras_por_lote, restantes - k * parametros.muestras_por_lote) for k in range(min(lotes_por_ronda, -(-restantes // parametros.muestras_por_lote)))]
+            semillas_ronda = secuencia_semillas.spawn(len(cantidades))
+            lotes = ejecutor.map(evaluar_lote_monte_carlo, semillas_ronda, cantidades) if ejecutor else map(evaluador.evaluar_lote, semillas_ronda, cantidades)
+            for lote in lotes:
+                estadisticas.acumular(lote)
+            _, semiancho_perdida = estadisticas.probabilidad(estadisticas.eventos_perdida_carga)
+            _, semiancho_sobrecarga = estadisticas.probabilidad(estadisticas.eventos_sobrecarga)
+            if max(semiancho_perdida, semiancho_sobrecarga) <= tolerancia:
+                convergio = True
+                break
+    finally:
+        if ejecutor:
+            ejecutor.shutdown()
+    return estadisticas, convergio
+
+@dataclass
+class ResultadosFlujoAC:
+    magnitudes_voltaje_pu: List[float]
+    angulos_radianes: List[float]
+    flujos_mw: List[float]
+    flujos_mvar: List[float]
+    perdidas_mw: float
+    iteraciones: int
+    convergio: bool
+
+class FlujoDesacopladoRapido:
+    def __init__(self, lista_lineas: List[LineaTransmision], lista_nodos: List[NodoElectrico], mapa_indices_nodos: Dict[int, int]):
+        self.lista_lineas = lista_lineas
+        self.lista_nodos = lista_nodos
+        self.mapa_indices_nodos = mapa_indices_nodos
+        cantidad_nodos = len(lista_nodos)
+        self.matriz_Y = np.zeros((cantidad_nodos, cantidad_nodos), dtype=complex)
+        self.matriz_B_prima = np.zeros((cantidad_nodos, cantidad_nodos))
+        self.matriz_B_doble_prima = np.zeros((cantidad_nodos, cantidad_nodos))
+        self.extremos_lineas: List[Optional[Tuple[int, int]]] = []
+        for linea in lista_lineas:
+            i = mapa_indices_nodos.get(linea.nodo_origen)
+            j = mapa_indices_nodos.get(linea.nodo_destino)
+            if i is None or j is None:
+                self.extremos_lineas.append(None)
+                continue
+            self.extremos_lineas.append((i, j))
+            if linea.activa:
+                cambios_prima, cambios_doble_prima = {}, {}
+                self.estampar_linea(self.matriz_Y, cambios_prima, cambios_doble_prima, linea, i, j, 1.0)
+                for (p, q), valor in cambios_prima.items():
+                    self.matriz_B_prima[p, q] += valor
+                for (p, q), valor in cambios_doble_prima.items():
+                    self.matriz_B_doble_prima[p, q] += valor
+        self.posiciones_B_prima = {i: i - 1 for i in range(1, cantidad_nodos)}
+        self.factor_B_prima = FactorizacionReutilizable.factorizar(self.matriz_B_prima[1:, 1:])
+        self.nodos_pv_base = frozenset(i for i, nodo in enumerate(lista_nodos) if i > 0 and nodo.generador_activo and es_nodo_control_voltaje(nodo))
+        self.factores_B_doble_prima: Dict[frozenset, Tuple[List[int], Optional[FactorizacionReutilizable]]] = {}
+
+    @staticmethod
+    def estampar_linea(matriz_Y: np.ndarray, cambios_prima: Dict[Tuple[int, int], float], cambios_doble_prima: Dict[Tuple[int, int], float], linea: LineaTransmision, i: int, j: int, signo: float):
+        impedancia_serie = complex(linea.resistencia_pu, linea.reactancia_pu)
+        admitancia_serie = 1.0 / impedancia_serie
+        shunt_medio = linea.susceptancia_shunt_pu / 2.0
+        matriz_Y[i, i] += signo * (admitancia_serie + 1j * shunt_medio)
+        matriz_Y[j, j] += signo * (admitancia_serie + 1j * shunt_medio)
+        matriz_Y[i, j] -= signo * admitancia_serie
+        matriz_Y[j, i] -= signo * admitancia_serie
+        agregar_cambio_linea(cambios_prima, i, j, signo / linea.reactancia_pu)
+        agregar_cambio_linea(cambios_doble_prima, i, j, signo * (-admitancia_serie.imag), -signo * shunt_medio)
+
+    def obtener_factor_B_doble_prima(self, nodos_pv: frozenset) -> Tuple[List[int], Optional[FactorizacionReutilizable]]:
+        if nodos_pv not in self.factores_B_doble_prima:
+            nodos_pq = [i for i in range(1, len(self.lista_nodos)) if i not in nodos_pv]
+            factor = FactorizacionReutilizable.factorizar(self.matriz_B_doble_prima[np.ix_(nodos_pq, nodos_pq)]) if nodos_pq else None
+            self.factores_B_doble_prima[nodos_pv] = (nodos_pq, factor)
+        return self.factores_B_doble_prima[nodos_pv]
+
+    def resolver(self, lineas_apagadas: Set[str], generadores_apagados: Set[int], cargas_apagadas: Set[int], tolerancia_pu: float = 1e-4, iteraciones_maximas: int = 30) -> Optional[ResultadosFlujoAC]:
+        cantidad_nodos = len(self.lista_nodos)
+        matriz_Y = self.matriz_Y.copy()
+        cambios_prima, cambios_doble_prima = {}, {}
+        for indice, linea in enumerate(self.lista_lineas):
+            extremos = self.extremos_lineas[indice]
+            if extremos is not None and linea.activa and f"{linea.nodo_origen}-{linea.nodo_destino}" in lineas_apagadas:
+                self.estampar_linea(matriz_Y, cambios_prima, cambios_doble_prima, linea, extremos[0], extremos[1], -1.0)
+        nodos_pv = frozenset(i for i in self.nodos_pv_base if self.lista_nodos[i].id not in generadores_apagados)
+        try:
+            nodos_pq, factor_doble_base = self.obtener_factor_B_doble_prima(nodos_pv)
+            factor_prima = self.factor_B_prima.actualizar(reducir_cambios_matriz(cambios_prima, self.posiciones_B_prima))
+            factor_doble_prima = factor_doble_base.actualizar(reducir_cambios_matriz(cambios_doble_prima, {nodo: k for k, nodo in enumerate(nodos_pq)})) if factor_doble_base else None
+        except np.linalg.LinAlgError:
+            return None
+        vector_P = calcular_inyecciones_programadas_mw(self.lista_nodos, generadores_apagados, cargas_apagadas) / POTENCIA_BASE_MVA
+        vector_Q = np.array([0.0 if nodo.id in cargas_apagadas else -nodo.potencia_reactiva_mvar for nodo in self.lista_nodos]) / POTENCIA_BASE_MVA
+        magnitudes_V = np.ones(cantidad_nodos)
+        for i in list(nodos_pv) + [0]:
+            magnitudes_V[i] = self.lista_nodos[i].voltaje_programado
+        angulos = np.zeros(cantidad_nodos)
+        convergio = False
+        iteracion = 0
+        while iteracion < iteraciones_maximas:
+            iteracion += 1
+            voltajes = magnitudes_V * np.exp(1j * angulos)
+            potencia_compleja = voltajes * np.conj(matriz_Y @ voltajes)
+            desbalance_P = vector_P[1:] - potencia_compleja.real[1:]
+            desbalance_Q = vector_Q[nodos_pq] - potencia_compleja.imag[nodos_pq]
+            if max(np.max(np.abs(desbalance_P), initial=0.0), np.max(np.abs(desbalance_Q), initial=0.0)) < tolerancia_pu:
+                convergio = True
+                break
+            angulos[1:] += factor_prima.resolver(desbalance_P / magnitudes_V[1:])
+            if factor_doble_prima is not None:
+                voltajes = magnitudes_V * np.exp(1j * angulos)
+                desbalance_Q = vector_Q[nodos_pq] - (voltajes * np.conj(matriz_Y @ voltajes)).imag[nodos_pq]
+                magnitudes_V[nodos_pq] += factor_doble_prima.resolver(desbalance_Q / magnitudes_V[nodos_pq])
+            if not np.all(np.isfinite(angulos)) or not np.all(np.isfinite(magnitudes_V)) or np.min(magnitudes_V) < 0.1:
+                break
+        voltajes = magnitudes_V * np.exp(1j * angulos)
+        flujos_mw, flujos_mvar = [], []
+        perdidas_pu = 0.0
+        for indice, linea in enumerate(self.lista_lineas):
+            extremos = self.extremos_lineas[indice]
+            if extremos is None or not linea.activa or f"{linea.nodo_origen}-{linea.nodo_destino}" in lineas_apagadas:
+                flujos_mw.append(0.0)
+                flujos_mvar.append(0.0)
+                continue
+            i, j = extremos
+            admitancia_serie = 1.0 / complex(linea.resistencia_pu, linea.reactancia_pu)
+            shunt_medio = 1j * linea.susceptancia_shunt_pu / 2.0
+            potencia_envio = voltajes[i] * np.conj(admitancia_serie * (voltajes[i] - voltajes[j]) + shunt_medio * voltajes[i])
+            potencia_recibo = voltajes[j] * np.conj(admitancia_serie * (voltajes[j] - voltajes[i]) + shunt_medio * voltajes[j])
+            perdidas_pu += (potencia_envio + potencia_recibo).real
+            flujos_mw.append(potencia_envio.real * POTENCIA_BASE_MVA)
+            flujos_mvar.append(potencia_envio.imag * POTENCIA_BASE_MVA)
+        return ResultadosFlujoAC(
+            magnitudes_voltaje_pu=magnitudes_V.tolist(), 
+            angulos_radianes=angulos.tolist(), 
+            flujos_mw=flujos_mw, 
+            flujos_mvar=flujos_mvar, 
+            perdidas_mw=perdidas_pu * POTENCIA_BASE_MVA, 
+            iteraciones=iteracion, 
+            convergio=convergio
+        )
+
 class VentanaCentroControl(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -194,6 +1039,13 @@ class VentanaCentroControl(QMainWindow):
         self.resultado_base: Optional[ResultadosSistema] = None
         self.resultado_actual: Optional[ResultadosSistema] = None
         self.riesgos_futuros_n_1: List[float] =[] 
+        self.riesgos_ac_n_1: List[float] = []
+        self.contingencias_marcadas_dc: List[Tuple[str, object]] = []
+        self.lineas_abiertas_actuales: Set[str] = set()
+        self.solucionador_ac: Optional[FlujoDesacopladoRapido] = None
+        self.escenarios: Dict[str, EscenarioRed] = {}
+        self.solucionador_redespacho = SolucionadorRedespacho()
+        self.resultado_redespacho: Optional[ResultadoRedespacho] = None
         self.texto_comando_fallas = ""
         self.interfaz_bloqueada = False
         self.construir_interfaz()
@@ -231,6 +1083,15 @@ class VentanaCentroControl(QMainWindow):
         self.input_comandos_falla.setFixedWidth(500)
         self.input_comandos_falla.textChanged.connect(self.evento_texto_fallas_modificado)
         diseno_contingencias.addWidget(self.input_comandos_falla)
+        self.casilla_verificacion_ac = QCheckBox("Verificar riesgos N-1 en AC (Desacoplado Rapido)")
+        self.casilla_verificacion_ac.stateChanged.connect(lambda _: self.ejecutar_analisis_completo())
+        diseno_contingencias.addWidget(self.casilla_verificacion_ac)
+        self.casilla_redespacho = QCheckBox("Redespacho Correctivo (PL)")
+        self.casilla_redespacho.stateChanged.connect(lambda _: self.ejecutar_analisis_completo())
+        diseno_contingencias.addWidget(self.casilla_redespacho)
+        boton_aplicar_redespacho = QPushButton("Aplicar Redespacho")
+        boton_aplicar_redespacho.clicked.connect(self.evento_aplicar_redespacho)
+        diseno_contingencias.addWidget(boton_aplicar_redespacho)
         diseno_contingencias.addStretch()
         diseno_principal.addLayout(diseno_contingencias)
         self.etiqueta_estado_sistema = QLabel("")
@@ -257,6 +1118,79 @@ class VentanaCentroControl(QMainWindow):
         self.tabla_nodos.cellChanged.connect(self.evento_edicion_tabla_nodos)
         layout_nodos.addWidget(self.tabla_nodos)
         pestanas_editor.addTab(panel_nodos, "Nodos y Generadores")
+        panel_escenarios = QWidget()
+        layout_escenarios = QVBoxLayout(panel_escenarios)
+        diseno_definicion_escenario = QHBoxLayout()
+        self.input_nombre_escenario = QLineEdit()
+        self.input_nombre_escenario.setPlaceholderText("Nombre")
+        self.input_nombre_escenario.setFixedWidth(150)
+        diseno_definicion_escenario.addWidget(self.input_nombre_escenario)
+        self.input_definicion_escenario = QLineEdit()
+        self.input_definicion_escenario.setPlaceholderText("ej: l1-4, g2, x2-4=0.15, lim1-2=60, pg3=80, pl5=90")
+        diseno_definicion_escenario.addWidget(self.input_definicion_escenario)
+        boton_crear_escenario = QPushButton("Crear Escenario")
+        boton_crear_escenario.clicked.connect(self.evento_crear_escenario)
+        diseno_definicion_escenario.addWidget(boton_crear_escenario)
+        boton_comparar_escenarios = QPushButton("Comparar Escenarios")
+        boton_comparar_escenarios.clicked.connect(self.evento_comparar_escenarios)
+        diseno_definicion_escenario.addWidget(boton_comparar_escenarios)
+        boton_eliminar_escenarios = QPushButton("Eliminar Escenarios")
+        boton_eliminar_escenarios.clicked.connect(self.evento_eliminar_escenarios)
+        diseno_definicion_escenario.addWidget(boton_eliminar_escenarios)
+        layout_escenarios.addLayout(diseno_definicion_escenario)
+        self.etiqueta_escenarios = QLabel("Escenarios: (ninguno)")
+        layout_escenarios.addWidget(self.etiqueta_escenarios)
+        self.tabla_escenarios = QTableWidget()
+        layout_escenarios.addWidget(self.tabla_escenarios)
+        pestanas_editor.addTab(panel_escenarios, "Escenarios (What-If)")
+        panel_transferencia = QWidget()
+        layout_transferencia = QVBoxLayout(panel_transferencia)
+        diseno_pares_transferencia = QHBoxLayout()
+        diseno_pares_transferencia.addWidget(QLabel("Pares Fuente>Sumidero (ej: 2>5, 3>4; vacio = generadores a cargas):"))
+        self.input_pares_transferencia = QLineEdit()
+        diseno_pares_transferencia.addWidget(self.input_pares_transferencia)
+        boton_calcular_atc = QPushButton("Calcular ATC")
+        boton_calcular_atc.clicked.connect(self.evento_calcular_transferencias)
+        diseno_pares_transferencia.addWidget(boton_calcular_atc)
+        layout_transferencia.addLayout(diseno_pares_transferencia)
+        self.tabla_transferencias = QTableWidget()
+        layout_transferencia.addWidget(self.tabla_transferencias)
+        pestanas_editor.addTab(panel_transferencia, "Capacidad de Transferencia (ATC)")
+        panel_cascadas = QWidget()
+        layout_cascadas = QVBoxLayout(panel_cascadas)
+        diseno_barrido_cascadas = QHBoxLayout()
+        self.casilla_eventos_dobles = QCheckBox("Incluir eventos dobles (N-2)")
+        self.casilla_eventos_dobles.setChecked(True)
+        diseno_barrido_cascadas.addWidget(self.casilla_eventos_dobles)
+        boton_barrido_cascadas = QPushButton("Ejecutar Barrido de Cascadas")
+        boton_barrido_cascadas.clicked.connect(self.evento_barrido_cascadas)
+        diseno_barrido_cascadas.addWidget(boton_barrido_cascadas)
+        diseno_barrido_cascadas.addStretch()
+        layout_cascadas.addLayout(diseno_barrido_cascadas)
+        self.tabla_cascadas = QTableWidget()
+        self.tabla_cascadas.cellDoubleClicked.connect(self.evento_seleccionar_evento_cascada)
+        layout_cascadas.addWidget(self.tabla_cascadas)
+        pestanas_editor.addTab(panel_cascadas, "Severidad de Cascadas")
+        panel_probabilistico = QWidget()
+        layout_probabilistico = QVBoxLayout(panel_probabilistico)
+        diseno_parametros_monte_carlo = QHBoxLayout()
+        self.input_semilla_monte_carlo = QLineEdit("12345")
+        self.input_muestras_monte_carlo = QLineEdit("200000")
+        self.input_desviacion_carga = QLineEdit("5")
+        self.input_desviacion_generacion = QLineEdit("5")
+        self.input_correlacion_monte_carlo = QLineEdit("0.8")
+        for etiqueta, campo in [("Semilla:", self.input_semilla_monte_carlo), ("Muestras max.:", self.input_muestras_monte_carlo), ("Desv. Carga (%):", self.input_desviacion_carga), ("Desv. Generacion (%):", self.input_desviacion_generacion), ("Correlacion:", self.input_correlacion_monte_carlo)]:
+            diseno_parametros_monte_carlo.addWidget(QLabel(etiqueta))
+            campo.setFixedWidth(80)
+            diseno_parametros_monte_carlo.addWidget(campo)
+        boton_monte_carlo = QPushButton("Ejecutar Monte Carlo")
+        boton_monte_carlo.clicked.connect(self.evento_ejecutar_monte_carlo)
+        diseno_parametros_monte_carlo.addWidget(boton_monte_carlo)
+        diseno_parametros_monte_carlo.addStretch()
+        layout_probabilistico.addLayout(diseno_parametros_monte_carlo)
+        self.tabla_monte_carlo = QTableWidget()
+        layout_probabilistico.addWidget(self.tabla_monte_carlo)
+        pestanas_editor.addTab(panel_probabilistico, "Evaluacion Probabilistica")
         divisor_paneles.addWidget(pestanas_editor)
         panel_resultados = QWidget()
         layout_resultados = QVBoxLayout(panel_resultados)
@@ -299,6 +1233,7 @@ class VentanaCentroControl(QMainWindow):
                 if lineas_leidas and nodos_leidos:
                     self.lista_lineas = lineas_leidas
                     self.lista_nodos = nodos_leidos
+                    self.solucionador_redespacho = SolucionadorRedespacho()
                     self.ejecutar_analisis_completo()
             except Exception as e:
                 QMessageBox.critical(self, "Error al leer", str(e))
@@ -310,6 +1245,16 @@ class VentanaCentroControl(QMainWindow):
         self.resultado_base = None
         self.resultado_actual = None
         self.riesgos_futuros_n_1.clear()
+        self.riesgos_ac_n_1.clear()
+        self.contingencias_marcadas_dc.clear()
+        self.lineas_abiertas_actuales.clear()
+        self.solucionador_ac = None
+        self.solucionador_redespacho = SolucionadorRedespacho()
+        self.resultado_redespacho = None
+        self.evento_eliminar_escenarios()
+        self.tabla_transferencias.setRowCount(0)
+        self.tabla_cascadas.setRowCount(0)
+        self.tabla_monte_carlo.setRowCount(0)
         self.input_comandos_falla.blockSignals(True)
         self.input_comandos_falla.clear()
         self.texto_comando_fallas = ""
@@ -329,11 +1274,11 @@ class VentanaCentroControl(QMainWindow):
         self.texto_comando_fallas = texto
         self.ejecutar_analisis_completo()
 
-    def clasificar_comandos_falla(self) -> Tuple[Set[str], Set[int], Set[int]]:
+    def clasificar_comandos_falla(self, texto: Optional[str] = None) -> Tuple[Set[str], Set[int], Set[int]]:
         fallas_lineas = set()
         fallas_generadores = set()
         fallas_cargas = set()
-        comandos = self.texto_comando_fallas.replace(" ", "").split(',')
+        comandos = (self.texto_comando_fallas if texto is None else texto).replace(" ", "").split(',')
         for comando in comandos:
             if not comando: 
                 continue
@@ -349,6 +1294,298 @@ class VentanaCentroControl(QMainWindow):
                 fallas_lineas.add(comando)
         return fallas_lineas, fallas_generadores, fallas_cargas
 
+    def construir_escenario(self, nombre: str, texto: str) -> EscenarioRed:
+        escenario = EscenarioRed(nombre=nombre)
+        nombres_lineas = {f"{l.nodo_origen}-{l.nodo_destino}" for l in self.lista_lineas}
+        ids_nodos = {n.id for n in self.lista_nodos}
+        comandos_falla = []
+        for comando in texto.replace(" ", "").split(','):
+            if '=' not in comando:
+                comandos_falla.append(comando)
+                continue
+            clave, valor_texto = comando.split('=', 1)
+            coincidencia = re.match(r"^([a-z]+)(.+)$", clave.lower())
+            valor = convertir_texto_a_numero(valor_texto)
+            if not coincidencia or valor is None:
+                raise ValueError(f"Modificacion no valida: {comando}")
+            prefijo, elemento = coincidencia.groups()
+            if prefijo in CAMPOS_MODIFICABLES_LINEA and '-' in elemento:
+                if elemento not in nombres_lineas:
+                    raise ValueError(f"La linea {elemento} no existe: {comando}")
+                if (prefijo == "x" and valor <= 0.0) or valor < 0.0:
+                    raise ValueError(f"Valor fuera de rango: {comando}")
+                escenario.cambios_lineas.setdefault(elemento, {})[CAMPOS_MODIFICABLES_LINEA[prefijo]] = valor
+            elif prefijo in CAMPOS_MODIFICABLES_NODO and elemento.isdigit():
+                if int(elemento) not in ids_nodos:
+                    raise ValueError(f"El nodo {elemento} no existe: {comando}")
+                if prefijo != "ql" and valor < 0.0:
+                    raise ValueError(f"Valor fuera de rango: {comando}")
+                escenario.cambios_nodos.setdefault(int(elemento), {})[CAMPOS_MODIFICABLES_NODO[prefijo]] = valor
+            else:
+                raise ValueError(f"Modificacion no valida: {comando}")
+        for comando in comandos_falla:
+            if comando and not any(self.clasificar_comandos_falla(comando)):
+                raise ValueError(f"Falla no valida: {comando}")
+        escenario.lineas_apagadas, escenario.generadores_apagados, escenario.cargas_apagadas = self.clasificar_comandos_falla(",".join(comandos_falla))
+        if not escenario.lineas_apagadas <= nombres_lineas or not (escenario.generadores_apagados | escenario.cargas_apagadas) <= ids_nodos:
+            elementos = sorted(escenario.lineas_apagadas - nombres_lineas) + [str(i) for i in sorted((escenario.generadores_apagados | escenario.cargas_apagadas) - ids_nodos)]
+            raise ValueError(f"Elementos inexistentes en las fallas: {', '.join(elementos)}")
+        return escenario
+
+    def evento_crear_escenario(self):
+        nombre = self.input_nombre_escenario.text().strip() or f"E{len(self.escenarios) + 1}"
+        try:
+            self.escenarios[nombre] = self.construir_escenario(nombre, self.input_definicion_escenario.text())
+        except ValueError as e:
+            QMessageBox.warning(self, "Escenario no valido", str(e))
+            return
+        self.input_nombre_escenario.clear()
+        self.input_definicion_escenario.clear()
+        self.etiqueta_escenarios.setText("Escenarios: " + ", ".join(self.escenarios))
+
+    def evento_eliminar_escenarios(self):
+        self.escenarios.clear()
+        self.tabla_escenarios.setRowCount(0)
+        self.tabla_escenarios.setColumnCount(0)
+        self.etiqueta_escenarios.setText("Escenarios: (ninguno)")
+
+    def evento_comparar_escenarios(self):
+        if len(self.lista_nodos) < 2 or not self.escenarios:
+            return
+        try:
+            resolutor = ResolutorEscenarios(self.lista_lineas, self.lista_nodos, self.mapa_indices_nodos)
+        except np.linalg.LinAlgError:
+            QMessageBox.warning(self, "Escenarios", "La red base no es convergente (Posible Isla Electrica).")
+            return
+        inicio = time.perf_counter()
+        resultados = resolutor.resolver_lote([EscenarioRed("Base")] + list(self.escenarios.values()))
+        tiempo_total_ms = (time.perf_counter() - inicio) * 1000.0
+        self.mostrar_comparacion_escenarios(resultados)
+        self.lista_consola.addItem("")
+        self.lista_consola.addItem(f"COMPARACION DE ESCENARIOS ({len(resultados) - 1} escenarios resueltos en lote en {tiempo_total_ms:.2f} ms)")
+        for resultado in resultados[1:]:
+            if not resultado.topologia_valida:
+                self.lista_consola.addItem(f"Escenario {resultado.nombre}: Se detecto Isla Electrica.")
+                continue
+            sobrecargas = sum(1 for i, limite in enumerate(resultado.limites_mw) if resultado.lineas_en_servicio[i] and limite > 0.0 and abs(resultado.flujos_mw[i]) > limite)
+            en_riesgo = sum(1 for i, limite in enumerate(resultado.limites_mw) if limite > 0.0 and resultado.riesgos_n_1[i] > limite)
+            self.lista_consola.addItem(f"Escenario {resultado.nombre}: {sobrecargas} sobrecargas, {en_riesgo} lineas en riesgo N-1 ({resultado.tiempo_ms:.2f} ms).")
+
+    def clasificar_pares_transferencia(self, texto: str) -> List[Tuple[int, int]]:
+        pares = []
+        for comando in texto.replace(" ", "").split(','):
+            if not comando:
+                continue
+            partes = comando.split('>')
+            if len(partes) != 2 or not partes[0].isdigit() or not partes[1].isdigit() or int(partes[0]) not in self.mapa_indices_nodos or int(partes[1]) not in self.mapa_indices_nodos or partes[0] == partes[1]:
+                raise ValueError(f"Par de transferencia no valido: {comando}")
+            pares.append((self.mapa_indices_nodos[int(partes[0])], self.mapa_indices_nodos[int(partes[1])]))
+        if not pares:
+            fuentes = [i for i, n in enumerate(self.lista_nodos) if n.generador_activo and (n.potencia_generada_mw > 0 or es_nodo_control_voltaje(n))]
+            sumideros = [i for i, n in enumerate(self.lista_nodos) if n.potencia_carga_mw > 0]
+            pares = [(f, k) for f in fuentes for k in sumideros if f != k]
+        return pares
+
+    def evento_calcular_transferencias(self):
+        if not self.resultado_actual or not self.resultado_actual.topologia_valida:
+            QMessageBox.warning(self, "Capacidad de Transferencia", "La red actual no es convergente (Posible Isla Electrica).")
+            return
+        try:
+            pares = self.clasificar_pares_transferencia(self.input_pares_transferencia.text())
+        except ValueError as e:
+            QMessageBox.warning(self, "Capacidad de Transferencia", str(e))
+            return
+        lineas_en_servicio = np.array([l.activa and f"{l.nodo_origen}-{l.nodo_destino}" not in self.lineas_abiertas_actuales for l in self.lista_lineas], dtype=bool)
+        inicio = time.perf_counter()
+        resultados = calcular_capacidad_transferencia(
+            np.array(self.resultado_actual.flujos_mw), 
+            self.resultado_actual.matriz_gsf, 
+            self.resultado_actual.matriz_lodf, 
+            np.array([l.limite_potencia_mw for l in self.lista_lineas]), 
+            lineas_en_servicio, 
+            pares
+        )
+        tiempo_ms = (time.perf_counter() - inicio) * 1000.0
+        resultados.sort(key=lambda r: r.margen_mw)
+        cabeceras = ["Fuente", "Sumidero", "ATC (MW)", "Elemento Limitante", "Contingencia"]
+        self.tabla_transferencias.clear()
+        self.tabla_transferencias.setColumnCount(len(cabeceras))
+        self.tabla_transferencias.setHorizontalHeaderLabels(cabeceras)
+        self.configurar_tabla_con_autoajuste(self.tabla_transferencias)
+        self.tabla_transferencias.setRowCount(len(resultados))
+        for fila, resultado in enumerate(resultados):
+            self.tabla_transferencias.setItem(fila, 0, QTableWidgetItem(str(self.lista_nodos[resultado.indice_fuente].id)))
+            self.tabla_transferencias.setItem(fila, 1, QTableWidgetItem(str(self.lista_nodos[resultado.indice_sumidero].id)))
+            if resultado.linea_limitante is None:
+                self.tabla_transferencias.setItem(fila, 2, QTableWidgetItem("Sin limite"))
+                self.tabla_transferencias.setItem(fila, 3, QTableWidgetItem("-"))
+                self.tabla_transferencias.setItem(fila, 4, QTableWidgetItem("-"))
+                continue
+            celda_margen = QTableWidgetItem(f"{resultado.margen_mw:.1f}")
+            if resultado.margen_mw <= 0.0:
+                celda_margen.setForeground(QColor("red"))
+                celda_margen.setFont(QFont("Arial", 10, QFont.Weight.Bold))
+            self.tabla_transferencias.setItem(fila, 2, celda_margen)
+            linea_limitante = self.lista_lineas[resultado.linea_limitante]
+            self.tabla_transferencias.setItem(fila, 3, QTableWidgetItem(f"L {linea_limitante.nodo_origen}-{linea_limitante.nodo_destino}"))
+            if resultado.contingencia_limitante is None:
+                self.tabla_transferencias.setItem(fila, 4, QTableWidgetItem("Caso Base"))
+            else:
+                linea_contingencia = self.lista_lineas[resultado.contingencia_limitante]
+                self.tabla_transferencias.setItem(fila, 4, QTableWidgetItem(f"Salida L {linea_contingencia.nodo_origen}-{linea_contingencia.nodo_destino}"))
+        self.lista_consola.addItem("")
+        self.lista_consola.addItem(f"CAPACIDAD DE TRANSFERENCIA: {len(resultados)} pares evaluados contra caso base y N-1 completo en {tiempo_ms:.2f} ms.")
+
+    def evento_barrido_cascadas(self):
+        if len(self.lista_nodos) < 2:
+            return
+        self.etiqueta_estado_sistema.setText("Ejecutando barrido de cascadas...")
+        QApplication.processEvents()
+        inicio = time.perf_counter()
+        try:
+            resultados = barrer_cascadas(self.lista_lineas, self.lista_nodos, self.casilla_eventos_dobles.isChecked())
+        except np.linalg.LinAlgError:
+            QMessageBox.warning(self, "Barrido de Cascadas", "La red base no es convergente (Posible Isla Electrica).")
+            self.actualizar_pantalla_resultados()
+            return
+        tiempo_s = time.perf_counter() - inicio
+        cabeceras = ["Evento Inicial", "Profundidad", "Lineas Perdidas", "Isla Electrica"]
+        self.tabla_cascadas.clear()
+        self.tabla_cascadas.setColumnCount(len(cabeceras))
+        self.tabla_cascadas.setHorizontalHeaderLabels(cabeceras)
+        self.configurar_tabla_con_autoajuste(self.tabla_cascadas)
+        self.tabla_cascadas.setRowCount(len(resultados))
+        for fila, resultado in enumerate(resultados):
+            self.tabla_cascadas.setItem(fila, 0, QTableWidgetItem(", ".join(resultado.evento_inicial)))
+            self.tabla_cascadas.setItem(fila, 1, QTableWidgetItem(str(resultado.profundidad)))
+            self.tabla_cascadas.setItem(fila, 2, QTableWidgetItem(str(resultado.lineas_perdidas)))
+            celda_isla = QTableWidgetItem("SI" if resultado.formo_isla else "No")
+            if resultado.formo_isla:
+                celda_isla.setForeground(QColor("red"))
+                celda_isla.setFont(QFont("Arial", 10, QFont.Weight.Bold))
+            elif resultado.profundidad > 0:
+                celda_isla.setForeground(QColor("#d97706"))
+            self.tabla_cascadas.setItem(fila, 3, celda_isla)
+        self.actualizar_pantalla_resultados()
+        eventos_con_isla = sum(1 for r in resultados if r.formo_isla)
+        eventos_con_cascada = sum(1 for r in resultados if r.profundidad > 0)
+        self.lista_consola.addItem("")
+        self.lista_consola.addItem(f"BARRIDO DE CASCADAS: {len(resultados)} eventos iniciales en {tiempo_s:.2f} s. {eventos_con_cascada} provocan cascada y {eventos_con_isla} terminan en Isla Electrica.")
+
+    def leer_parametros_monte_carlo(self) -> Tuple[ParametrosMonteCarlo, int, int]:
+        semilla = convertir_texto_a_numero(self.input_semilla_monte_carlo.text())
+        muestras_maximas = convertir_texto_a_numero(self.input_muestras_monte_carlo.text())
+        desviacion_carga = convertir_texto_a_numero(self.input_desviacion_carga.text())
+        desviacion_generacion = convertir_texto_a_numero(self.input_desviacion_generacion.text())
+        correlacion = convertir_texto_a_numero(self.input_correlacion_monte_carlo.text())
+        if semilla is None or semilla < 0 or semilla != int(semilla):
+            raise ValueError("La semilla debe ser un entero mayor o igual a 0.")
+        if muestras_maximas is None or muestras_maximas < 1:
+            raise ValueError("El numero maximo de muestras debe ser mayor o igual a 1.")
+        if desviacion_carga is None or desviacion_carga < 0 or desviacion_generacion is None or desviacion_generacion < 0:
+            raise ValueError("Las desviaciones de carga y generacion deben ser mayores o iguales a 0.")
+        if correlacion is None or not 0.0 <= correlacion <= 1.0:
+            raise ValueError("La correlacion debe estar entre 0 y 1.")
+        parametros = ParametrosMonteCarlo(desviacion_carga=desviacion_carga / 100.0, desviacion_generacion=desviacion_generacion / 100.0, correlacion=correlacion)
+        return parametros, int(semilla), int(muestras_maximas)
+
+    def evento_ejecutar_monte_carlo(self):
+        if len(self.lista_nodos) < 2:
+            return
+        try:
+            parametros, semilla, muestras_maximas = self.leer_parametros_monte_carlo()
+        except ValueError as e:
+            QMessageBox.warning(self, "Monte Carlo", str(e))
+            return
+        self.etiqueta_estado_sistema.setText("Ejecutando evaluacion probabilistica Monte Carlo...")
+        QApplication.processEvents()
+        inicio = time.perf_counter()
+        try:
+            estadisticas, convergio = ejecutar_monte_carlo(self.lista_lineas, self.lista_nodos, parametros, semilla, muestras_maximas)
+        except np.linalg.LinAlgError:
+            QMessageBox.warning(self, "Monte Carlo", "La red base no es convergente (Posible Isla Electrica).")
+            self.actualizar_pantalla_resultados()
+            return
+        tiempo_s = time.perf_counter() - inicio
+        cabeceras = ["Linea", "Limite Potencia", "Prob. Sobrecarga", "IC 95% (+/-)"]
+        self.tabla_monte_carlo.clear()
+        self.tabla_monte_carlo.setColumnCount(len(cabeceras))
+        self.tabla_monte_carlo.setHorizontalHeaderLabels(cabeceras)
+        self.configurar_tabla_con_autoajuste(self.tabla_monte_carlo)
+        self.tabla_monte_carlo.setRowCount(len(self.lista_lineas))
+        for i, linea in enumerate(self.lista_lineas):
+            probabilidad, semiancho = estadisticas.probabilidad(estadisticas.sobrecargas_por_linea[i])
+            self.tabla_monte_carlo.setItem(i, 0, QTableWidgetItem(f"{linea.nodo_origen}-{linea.nodo_destino}"))
+            self.tabla_monte_carlo.setItem(i, 1, QTableWidgetItem(f"{linea.limite_potencia_mw:.1f}"))
+            celda_probabilidad = QTableWidgetItem(f"{probabilidad:.4f}")
+            if probabilidad > 0.01:
+                celda_probabilidad.setForeground(QColor("red"))
+                celda_probabilidad.setFont(QFont("Arial", 10, QFont.Weight.Bold))
+            elif probabilidad > 0.0:
+                celda_probabilidad.setForeground(QColor("#d97706"))
+            self.tabla_monte_carlo.setItem(i, 2, celda_probabilidad)
+            self.tabla_monte_carlo.setItem(i, 3, QTableWidgetItem(f"{semiancho:.4f}"))
+        self.actualizar_pantalla_resultados()
+        probabilidad_perdida, semiancho_perdida = estadisticas.probabilidad(estadisticas.eventos_perdida_carga)
+        probabilidad_sobrecarga, semiancho_sobrecarga = estadisticas.probabilidad(estadisticas.eventos_sobrecarga)
+        probabilidad_isla, semiancho_isla = estadisticas.probabilidad(estadisticas.eventos_isla)
+        potencia_no_suministrada, semiancho_potencia = estadisticas.potencia_no_suministrada_esperada()
+        self.lista_consola.addItem("")
+        self.lista_consola.addItem(f"EVALUACION PROBABILISTICA MONTE CARLO: {estadisticas.muestras} muestras en {tiempo_s:.2f} s ({'convergio' if convergio else 'limite de muestras alcanzado'}).")
+        self.lista_consola.addItem(f"Probabilidad de Perdida de Carga (LOLP): {probabilidad_perdida:.4f} +/- {semiancho_perdida:.4f}")
+        self.lista_consola.addItem(f"Potencia Esperada No Suministrada: {potencia_no_suministrada:.2f} +/- {semiancho_potencia:.2f} MW")
+        self.lista_consola.addItem(f"Probabilidad de Sobrecarga en la Red: {probabilidad_sobrecarga:.4f} +/- {semiancho_sobrecarga:.4f}")
+        self.lista_consola.addItem(f"Probabilidad de Isla Electrica: {probabilidad_isla:.4f} +/- {semiancho_isla:.4f}")
+
+    def evento_seleccionar_evento_cascada(self, fila, columna):
+        celda_evento = self.tabla_cascadas.item(fila, 0)
+        if celda_evento:
+            self.input_comandos_falla.setText(celda_evento.text())
+
+    def mostrar_comparacion_escenarios(self, resultados: List[ResultadosEscenario]):
+        base = resultados[0]
+        cabeceras = ["Linea", "Limite Potencia", "Base", "Riesgo Base"]
+        for resultado in resultados[1:]:
+            cabeceras += [resultado.nombre, f"Dif. {resultado.nombre}", f"Riesgo {resultado.nombre}"]
+        self.tabla_escenarios.clear()
+        self.tabla_escenarios.setColumnCount(len(cabeceras))
+        self.tabla_escenarios.setHorizontalHeaderLabels(cabeceras)
+        self.configurar_tabla_con_autoajuste(self.tabla_escenarios)
+        self.tabla_escenarios.setRowCount(len(self.lista_lineas))
+        for i, linea in enumerate(self.lista_lineas):
+            self.tabla_escenarios.setItem(i, 0, QTableWidgetItem(f"{linea.nodo_origen}-{linea.nodo_destino}"))
+            self.tabla_escenarios.setItem(i, 1, QTableWidgetItem(f"{linea.limite_potencia_mw:.1f}"))
+            self.tabla_escenarios.setItem(i, 2, QTableWidgetItem(f"{base.flujos_mw[i]:.1f}"))
+            self.tabla_escenarios.setItem(i, 3, QTableWidgetItem(f"{base.riesgos_n_1[i]:.1f}"))
+            for k, resultado in enumerate(resultados[1:]):
+                columna = 4 + 3 * k
+                limite = resultado.limites_mw[i]
+                if not resultado.topologia_valida:
+                    for desplazamiento in range(3):
+                        celda_isla = QTableWidgetItem("Isla")
+                        celda_isla.setForeground(QColor("red"))
+                        self.tabla_escenarios.setItem(i, columna + desplazamiento, celda_isla)
+                    continue
+                if not resultado.lineas_en_servicio[i]:
+                    celda_flujo = QTableWidgetItem("Desconectado")
+                    celda_flujo.setForeground(QColor("red"))
+                else:
+                    celda_flujo = QTableWidgetItem(f"{resultado.flujos_mw[i]:.1f}")
+                    if limite > 0.0 and abs(resultado.flujos_mw[i]) > limite:
+                        celda_flujo.setForeground(QColor("orange"))
+                        celda_flujo.setFont(QFont("Arial", 10, QFont.Weight.Bold))
+                diferencia = abs(resultado.flujos_mw[i]) - abs(base.flujos_mw[i])
+                celda_diferencia = QTableWidgetItem(f"{diferencia:+.1f}")
+                if abs(diferencia) >= 0.05:
+                    celda_diferencia.setForeground(QColor("#d97706") if diferencia > 0 else QColor("green"))
+                celda_riesgo = QTableWidgetItem(f"{resultado.riesgos_n_1[i]:.1f}")
+                if limite > 0.0 and resultado.riesgos_n_1[i] > limite:
+                    celda_riesgo.setForeground(QColor("red"))
+                    celda_riesgo.setFont(QFont("Arial", 10, QFont.Weight.Bold))
+                self.tabla_escenarios.setItem(i, columna, celda_flujo)
+                self.tabla_escenarios.setItem(i, columna + 1, celda_diferencia)
+                self.tabla_escenarios.setItem(i, columna + 2, celda_riesgo)
+
     def ejecutar_analisis_completo(self):
         self.lista_nodos.sort(key=lambda n: n.id)
         self.mapa_indices_nodos = {nodo.id: indice for indice, nodo in enumerate(self.lista_nodos)}
@@ -362,6 +1599,12 @@ class VentanaCentroControl(QMainWindow):
         fallas_lin, fallas_gen, fallas_car = self.clasificar_comandos_falla()
         self.simular_propagacion_cascadas(fallas_lin, fallas_gen, fallas_car)
         self.simular_prediccion_contingencias_n_1(fallas_lin, fallas_gen, fallas_car)
+        self.riesgos_ac_n_1 = []
+        if self.casilla_verificacion_ac.isChecked():
+            self.verificar_contingencias_en_ac(fallas_gen, fallas_car)
+        self.resultado_redespacho = None
+        if self.casilla_redespacho.isChecked():
+            self.calcular_redespacho_correctivo(fallas_gen, fallas_car)
         self.actualizar_tablas_edicion()
         self.actualizar_pantalla_resultados()
 
@@ -370,6 +1613,7 @@ class VentanaCentroControl(QMainWindow):
         lineas_abiertas = set(lineas_caidas)
         estado_convergente = None
         numero_iteracion = 1
+        self.lineas_abiertas_actuales = lineas_abiertas
         if not lineas_abiertas and not generadores_caidos and not cargas_caidas:
             self.lista_consola.addItem("Operacion normal estatica de la red.")
             self.resultado_actual = self.calcular_flujo_dc_potencia(set(), set(), set())
@@ -400,6 +1644,7 @@ class VentanaCentroControl(QMainWindow):
         self.resultado_actual = estado_convergente
 
     def simular_prediccion_contingencias_n_1(self, lineas_caidas: Set[str], generadores_caidos: Set[int], cargas_caidas: Set[int]):
+        self.contingencias_marcadas_dc = []
         if not self.resultado_actual or not self.resultado_actual.topologia_valida:
             self.riesgos_futuros_n_1 = [0.0] * len(self.lista_lineas)
             return
@@ -420,6 +1665,8 @@ class VentanaCentroControl(QMainWindow):
                 self.riesgos_futuros_n_1[i] = max(self.riesgos_futuros_n_1[i], abs(flujo_post_falla))
                 if linea_monitoreada.limite_potencia_mw > 0.0 and abs(flujo_post_falla) > linea_monitoreada.limite_potencia_mw:
                     conteo_vulnerabilidades += 1
+                    if ("linea", nombre_out) not in self.contingencias_marcadas_dc:
+                        self.contingencias_marcadas_dc.append(("linea", nombre_out))
                     mensaje = f"RIESGO DETECTADO: Si cae la linea {nombre_out}, se sobrecargara la linea {linea_monitoreada.nodo_origen}-{linea_monitoreada.nodo_destino} a {abs(flujo_post_falla):.1f} MW."
                     self.lista_consola.addItem(mensaje)
         for nodo_gen in self.lista_nodos:
@@ -441,14 +1688,98 @@ class VentanaCentroControl(QMainWindow):
                 self.riesgos_futuros_n_1[k] = max(self.riesgos_futuros_n_1[k], abs(flujo_post_falla))
                 if linea_monitoreada.limite_potencia_mw > 0.0 and abs(flujo_post_falla) > linea_monitoreada.limite_potencia_mw:
                     conteo_vulnerabilidades += 1
+                    if ("generador", nodo_gen.id) not in self.contingencias_marcadas_dc:
+                        self.contingencias_marcadas_dc.append(("generador", nodo_gen.id))
                     mensaje = f"RIESGO DETECTADO: Si se dispara el Generador {nodo_gen.id}, la linea {linea_monitoreada.nodo_origen}-{linea_monitoreada.nodo_destino} subira a {abs(flujo_post_falla):.1f} MW."
                     self.lista_consola.addItem(mensaje)
         if conteo_vulnerabilidades == 0: 
             self.lista_consola.addItem("La red es completamente resistente ante cualquier evento unico (Criterio N-1 Satisfecho).")
 
+    def verificar_contingencias_en_ac(self, generadores_caidos: Set[int], cargas_caidas: Set[int]):
+        if not self.contingencias_marcadas_dc:
+            return
+        self.riesgos_ac_n_1 = [0.0] * len(self.lista_lineas)
+        self.lista_consola.addItem("")
+        self.lista_consola.addItem("VERIFICACION AC (DESACOPLADO RAPIDO) DE LAS CONTINGENCIAS MARCADAS POR EL FILTRO DC")
+        try:
+            self.solucionador_ac = FlujoDesacopladoRapido(self.lista_lineas, self.lista_nodos, self.mapa_indices_nodos)
+        except np.linalg.LinAlgError:
+            self.solucionador_ac = None
+            self.lista_consola.addItem("No fue posible factorizar B' y B'' de la red base. Verificacion AC omitida.")
+            return
+        for tipo_falla, elemento in self.contingencias_marcadas_dc:
+            lineas_falla = set(self.lineas_abiertas_actuales)
+            generadores_falla = set(generadores_caidos)
+            if tipo_falla == "linea":
+                lineas_falla.add(elemento)
+                descripcion = f"cae la linea {elemento}"
+            else:
+                generadores_falla.add(elemento)
+                descripcion = f"se dispara el Generador {elemento}"
+            resultado_ac = self.solucionador_ac.resolver(lineas_falla, generadores_falla, cargas_caidas)
+            if resultado_ac is None:
+                self.lista_consola.addItem(f"AC: Si {descripcion}, se forma una Isla Electrica.")
+                continue
+            if not resultado_ac.convergio:
+                self.lista_consola.addItem(f"AC: Si {descripcion}, el flujo AC no converge en {resultado_ac.iteraciones} iteraciones (posible colapso de voltaje).")
+                continue
+            sobrecargas_confirmadas = 0
+            for i, linea in enumerate(self.lista_lineas):
+                nombre_linea = f"{linea.nodo_origen}-{linea.nodo_destino}"
+                if not linea.activa or nombre_linea in lineas_falla:
+                    continue
+                flujo_ac = abs(resultado_ac.flujos_mw[i])
+                self.riesgos_ac_n_1[i] = max(self.riesgos_ac_n_1[i], flujo_ac)
+                if linea.limite_potencia_mw > 0.0 and flujo_ac > linea.limite_potencia_mw:
+                    sobrecargas_confirmadas += 1
+                    self.lista_consola.addItem(f"CONFIRMADO EN AC: Si {descripcion}, la linea {nombre_linea} llegara a {flujo_ac:.1f} MW (Perdidas: {resultado_ac.perdidas_mw:.1f} MW).")
+            if sobrecargas_confirmadas == 0:
+                self.lista_consola.addItem(f"DESCARTADO EN AC: Si {descripcion}, ningun limite se viola (V min: {min(resultado_ac.magnitudes_voltaje_pu):.3f} pu).")
+
+    def calcular_redespacho_correctivo(self, generadores_caidos: Set[int], cargas_caidas: Set[int]):
+        if not self.resultado_actual or not self.resultado_actual.topologia_valida:
+            return
+        lineas_en_servicio = np.array([l.activa and f"{l.nodo_origen}-{l.nodo_destino}" not in self.lineas_abiertas_actuales for l in self.lista_lineas], dtype=bool)
+        inicio = time.perf_counter()
+        self.resultado_redespacho = self.solucionador_redespacho.resolver(
+            np.array(self.resultado_actual.flujos_mw), 
+            self.resultado_actual.matriz_gsf, 
+            self.resultado_actual.matriz_lodf, 
+            np.array([l.limite_potencia_mw for l in self.lista_lineas]), 
+            lineas_en_servicio, 
+            self.lista_nodos, 
+            generadores_caidos, 
+            cargas_caidas
+        )
+        tiempo_ms = (time.perf_counter() - inicio) * 1000.0
+        resultado = self.resultado_redespacho
+        self.lista_consola.addItem("")
+        self.lista_consola.addItem(f"REDESPACHO CORRECTIVO (Programacion Lineal sobre GSF/LODF, solucionador: {resultado.solucionador})")
+        if not resultado.factible:
+            self.lista_consola.addItem("No existe un redespacho dentro de los limites de los generadores que elimine todas las violaciones.")
+            return
+        if resultado.total_mw <= 1e-6:
+            self.lista_consola.addItem("No se requiere redespacho: no hay violaciones en caso base ni ante contingencias N-1 de lineas o generadores.")
+            return
+        for i, nodo in enumerate(self.lista_nodos):
+            ajuste = resultado.ajustes_mw[i]
+            if abs(ajuste) < 0.05:
+                continue
+            accion = "Subir" if ajuste > 0 else "Bajar"
+            generacion_inicial = resultado.generacion_inicial_mw[i]
+            self.lista_consola.addItem(f"{accion} Generador {nodo.id} en {abs(ajuste):.1f} MW (de {generacion_inicial:.1f} a {generacion_inicial + ajuste:.1f} MW).")
+        self.lista_consola.addItem(f"Redespacho minimo: {resultado.total_mw:.1f} MW. {resultado.restricciones_activas} restricciones activas, {resultado.rondas} rondas, {tiempo_ms:.1f} ms.")
+
+    def evento_aplicar_redespacho(self):
+        if not self.resultado_redespacho or not self.resultado_redespacho.factible or self.resultado_redespacho.total_mw <= 1e-6:
+            return
+        for i, nodo in enumerate(self.lista_nodos):
+            if i > 0 and i < len(self.resultado_redespacho.ajustes_mw):
+                nodo.potencia_generada_mw = round(nodo.potencia_generada_mw + self.resultado_redespacho.ajustes_mw[i], 3)
+        self.ejecutar_analisis_completo()
+
     def calcular_flujo_dc_potencia(self, lineas_apagadas: Set[str], generadores_apagados: Set[int], cargas_apagadas: Set[int]) -> Optional[ResultadosSistema]:
         cantidad_nodos = len(self.lista_nodos)
-        cantidad_lineas = len(self.lista_lineas)
         matriz_B = np.zeros((cantidad_nodos, cantidad_nodos))
         for linea in self.lista_lineas:
             nombre = f"{linea.nodo_origen}-{linea.nodo_destino}"
@@ -462,24 +1793,12 @@ class VentanaCentroControl(QMainWindow):
                     matriz_B[i, j] -= susceptancia_ij
                     matriz_B[j, i] -= susceptancia_ij
         try: 
-            matriz_B_reducida = matriz_B[1:, 1:]
-            matriz_F_reducida = np.linalg.inv(matriz_B_reducida)
+            matriz_F_reducida = FactorizacionReutilizable.factorizar(matriz_B[1:, 1:]).inversa()
         except np.linalg.LinAlgError: 
             return None 
         matriz_F = np.zeros((cantidad_nodos, cantidad_nodos))
         matriz_F[1:, 1:] = matriz_F_reducida
-        vector_P = np.zeros(cantidad_nodos)
-        potencia_gen_caida = sum(b.potencia_generada_mw for b in self.lista_nodos if b.generador_activo and b.id in generadores_apagados)
-        suma_factores_participacion = sum(b.factor_participacion for b in self.lista_nodos if b.generador_activo and b.id not in generadores_apagados)
-        for i, nodo in enumerate(self.lista_nodos):
-            potencia_gen = 0.0
-            if nodo.generador_activo and nodo.id not in generadores_apagados:
-                potencia_gen = nodo.potencia_generada_mw
-                if suma_factores_participacion > 0 and potencia_gen_caida > 0:
-                    incremento_solicitado = potencia_gen_caida * (nodo.factor_participacion / suma_factores_participacion)
-                    potencia_gen = min(nodo.potencia_maxima_mw, potencia_gen + incremento_solicitado)
-            potencia_carga = 0.0 if (nodo.id in cargas_apagadas) else nodo.potencia_carga_mw
-            vector_P[i] = (potencia_gen - potencia_carga) / POTENCIA_BASE_MVA
+        vector_P = calcular_inyecciones_programadas_mw(self.lista_nodos, generadores_apagados, cargas_apagadas) / POTENCIA_BASE_MVA
         vector_theta_radianes = matriz_F @ vector_P
         flujos_resultantes_mw =[]
         for linea in self.lista_lineas:
@@ -494,30 +1813,8 @@ class VentanaCentroControl(QMainWindow):
                     flujos_resultantes_mw.append(flujo_en_pu * POTENCIA_BASE_MVA)
             else: 
                 flujos_resultantes_mw.append(0.0)
-        matriz_GSF = np.zeros((cantidad_lineas, cantidad_nodos))
-        for L, linea in enumerate(self.lista_lineas):
-            nodo_envio = self.mapa_indices_nodos.get(linea.nodo_origen)
-            nodo_recibo = self.mapa_indices_nodos.get(linea.nodo_destino)
-            if nodo_envio is not None and nodo_recibo is not None:
-                for i in range(cantidad_nodos):
-                    matriz_GSF[L, i] = (matriz_F[nodo_envio, i] - matriz_F[nodo_recibo, i]) / linea.reactancia_pu
-        matriz_LODF = np.zeros((cantidad_lineas, cantidad_lineas))
-        for L, linea_saliente in enumerate(self.lista_lineas):
-            idx_i = self.mapa_indices_nodos.get(linea_saliente.nodo_origen)
-            idx_m = self.mapa_indices_nodos.get(linea_saliente.nodo_destino)
-            if idx_i is not None and idx_m is not None:
-                reactancia_L = linea_saliente.reactancia_pu
-                denominador = reactancia_L - (matriz_F[idx_i, idx_i] + matriz_F[idx_m, idx_m] - 2.0 * matriz_F[idx_i, idx_m])
-                if abs(denominador) > 1e-6:
-                    for K, linea_observada in enumerate(self.lista_lineas):
-                        if L == K: 
-                            matriz_LODF[K, L] = -1.0
-                            continue
-                        idx_v = self.mapa_indices_nodos.get(linea_observada.nodo_origen)
-                        idx_w = self.mapa_indices_nodos.get(linea_observada.nodo_destino)
-                        if idx_v is not None and idx_w is not None:
-                            numerador = (matriz_F[idx_v, idx_i] - matriz_F[idx_v, idx_m]) - (matriz_F[idx_w, idx_i] - matriz_F[idx_w, idx_m])
-                            matriz_LODF[K, L] = (reactancia_L / linea_observada.reactancia_pu) * (numerador / denominador)
+        matriz_incidencia = construir_matriz_incidencia(self.lista_lineas, self.mapa_indices_nodos)
+        matriz_GSF, matriz_LODF = calcular_matrices_sensibilidad(matriz_F, matriz_incidencia, np.array([l.reactancia_pu for l in self.lista_lineas]))
         return ResultadosSistema(
             matriz_b=matriz_B, 
             matriz_f=matriz_F, 
@@ -683,7 +1980,7 @@ class VentanaCentroControl(QMainWindow):
             mensaje_semaforo = "CONTINGENCIA ACTIVA. Revisar factores resaltados en rojo para acciones correctivas."
             self.etiqueta_estado_sistema.setStyleSheet("color: #d97706;")
         self.etiqueta_estado_sistema.setText(mensaje_semaforo)
-        cabeceras_flujos =["Linea", "Base", "SCADA", "WLS", "Actual", "Limite Potencia", "Riesgo N-1"]
+        cabeceras_flujos =["Linea", "Base", "SCADA", "WLS", "Actual", "Limite Potencia", "Riesgo N-1", "Riesgo N-1 AC"]
         self.tabla_flujos.setColumnCount(len(cabeceras_flujos))
         self.tabla_flujos.setHorizontalHeaderLabels(cabeceras_flujos)
         self.configurar_tabla_con_autoajuste(self.tabla_flujos)
@@ -713,6 +2010,15 @@ class VentanaCentroControl(QMainWindow):
                 celda_riesgo.setForeground(QColor("red"))
                 celda_riesgo.setFont(QFont("Arial", 10, QFont.Weight.Bold))
             self.tabla_flujos.setItem(i, 6, celda_riesgo)
+            if i < len(self.riesgos_ac_n_1):
+                riesgo_ac = self.riesgos_ac_n_1[i]
+                celda_riesgo_ac = QTableWidgetItem(f"{riesgo_ac:.1f}")
+                if linea.limite_potencia_mw > 0.0 and riesgo_ac > linea.limite_potencia_mw: 
+                    celda_riesgo_ac.setForeground(QColor("red"))
+                    celda_riesgo_ac.setFont(QFont("Arial", 10, QFont.Weight.Bold))
+            else:
+                celda_riesgo_ac = QTableWidgetItem("-")
+            self.tabla_flujos.setItem(i, 7, celda_riesgo_ac)
         lista_nombres_buses = [str(b.id) for b in self.lista_nodos]
         self.volcar_matriz_forzada(self.tabla_matriz_b, self.resultado_actual.matriz_b, lista_nombres_buses, lista_nombres_buses)
         self.volcar_matriz_forzada(self.tabla_matriz_f, self.resultado_actual.matriz_f, lista_nombres_buses, lista_nombres_buses)